@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Asyncio Rightmove scraper: many searches and pages fetched concurrently
+from one event loop, through an AsyncTransport (httpx or aiohttp)
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from rightmove_webscraper import AsyncTokenBucket, AsyncTransport, shared_metrics
+from batch_scraper import BatchResult, combine_batch, load_manifest, write_batch
+from multi_page_scraper import (PageProgress, clean_search_url, combine_pages, create_output_folder,
+                                parse_rightmove_page)
+
+logger = logging.getLogger(__name__)
+
+
+async def scrape_rightmove_page_async(url: str, transport: AsyncTransport,
+                                      summary: bool = True) -> Tuple[pd.DataFrame, dict]:
+    """
+    Scrape a single page of Rightmove property data without blocking the event loop
+
+    Args:
+        url: Rightmove search results URL
+        transport: Asynchronous HTTP transport to make the request with
+        summary: Keep the long summary text of each listing (False = drop it to save memory)
+
+    Returns:
+        Tuple of (DataFrame with property listings, search_results dict)
+    """
+    with shared_metrics().timer('fetch'):
+        r = await transport.get(url)
+
+    if r.status_code != 200:
+        raise Exception(f"Failed to fetch page. Status code: {r.status_code}")
+
+    return parse_rightmove_page(r.content, summary=summary)
+
+
+async def iter_pages_async(base_url: str, max_pages: Optional[int] = None,
+                           transport: Optional[AsyncTransport] = None, raise_errors: bool = False,
+                           progress: Optional[Callable[[PageProgress], None]] = None,
+                           summary: bool = True) -> AsyncIterator[pd.DataFrame]:
+    """
+    Scrape the pages of results of a Rightmove search, yielding each page in order
+
+    The asynchronous counterpart of iter_pages. Once the page count is known the
+    next pages are requested ahead of the consumer, but no more than the
+    transport's concurrency at a time, so a slow consumer still paces the scrape
+    and memory stays bounded. Requests still pending when the consumer stops
+    iterating are cancelled.
+
+    Args:
+        base_url: Base search URL (without index parameter)
+        max_pages: Maximum number of pages to scrape (None = all pages)
+        transport: Asynchronous HTTP transport shared by all page requests (None = a new
+            transport without a rate limit)
+        raise_errors: Raise the error if any page can't be scraped, instead of
+            logging it and stopping (after the first page, with the pages yielded
+            so far as the only results)
+        progress: Optional callback called with a PageProgress after each page,
+            before the page is yielded
+        summary: Keep the long summary text of each listing (False = drop it to save memory)
+
+    Yields:
+        DataFrame of the listings of each page, in page order
+    """
+    if transport is None:
+        async with AsyncTransport() as transport:
+            async for df in iter_pages_async(base_url, max_pages, transport, raise_errors, progress, summary):
+                yield df
+        return
+
+    start = time.perf_counter()
+    total_rows = 0
+    result_count = None
+
+    def report(page_num: int, pages: int, rows: int):
+        nonlocal total_rows
+        total_rows += rows
+        logger.debug('Page %d/%d: %d properties', page_num + 1, pages, rows)
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            eta = elapsed / (page_num + 1) * (pages - page_num - 1)
+            progress(PageProgress(page_num + 1, pages, rows, total_rows, elapsed, eta, result_count))
+
+    logger.info('Scraping %s', base_url)
+    clean_url = clean_search_url(base_url)
+
+    try:
+        df, search_results = await scrape_rightmove_page_async(clean_url, transport, summary=summary)
+    except Exception as e:
+        if raise_errors:
+            raise
+        logger.error('Error scraping first page: %s', e)
+        return
+
+    if df.empty:
+        logger.warning('No properties found')
+        return
+
+    pagination = search_results.get('pagination', {})
+    total_pages = pagination.get('total', 1)
+    result_count = search_results.get('resultCount', 'Unknown')
+    logger.info('Total results available: %s (%d pages)', result_count, total_pages)
+
+    pages_to_scrape = min(max_pages, total_pages) if max_pages else total_pages
+    report(0, pages_to_scrape, len(df))
+    yield df
+
+    # Request the remaining pages ahead of the consumer, a window at a time
+    pending = deque()
+    next_page = 1
+    try:
+        for page_num in range(1, pages_to_scrape):
+            while next_page < pages_to_scrape and len(pending) < transport.concurrency:
+                page_url = f"{clean_url}&index={next_page * 24}"  # Rightmove uses 24 results per page
+                pending.append(asyncio.ensure_future(
+                    scrape_rightmove_page_async(page_url, transport, summary=summary)))
+                next_page += 1
+
+            try:
+                df, _ = await pending.popleft()
+            except Exception as e:
+                if raise_errors:
+                    raise
+                logger.warning('Error scraping page %d, stopping at page %d: %s', page_num + 1, page_num, e)
+                return
+
+            if df.empty:
+                logger.info('No properties found on page %d, stopping', page_num + 1)
+                return
+
+            report(page_num, pages_to_scrape, len(df))
+            yield df
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def iter_listings_async(base_url: str, **kwargs) -> AsyncIterator[dict]:
+    """
+    Scrape a Rightmove search one listing at a time, with each property id yielded only once
+
+    Args:
+        base_url: Base search URL (without index parameter)
+        **kwargs: Any other argument of iter_pages_async
+
+    Yields:
+        Dict of the columns of each listing
+    """
+    seen = set()
+    async for df in iter_pages_async(base_url, **kwargs):
+        for listing in df.to_dict('records'):
+            if listing['id'] not in seen:
+                seen.add(listing['id'])
+                yield listing
+
+
+async def scrape_all_pages_async(base_url: str, max_pages: Optional[int] = None,
+                                 transport: Optional[AsyncTransport] = None, raise_errors: bool = False,
+                                 progress: Optional[Callable[[PageProgress], None]] = None,
+                                 summary: bool = True) -> pd.DataFrame:
+    """
+    Scrape all pages of results from a Rightmove search (see iter_pages_async)
+
+    Returns:
+        DataFrame containing all properties from all pages
+    """
+    with shared_metrics().timer('scrape_all_pages'):
+        pages = [df async for df in iter_pages_async(base_url, max_pages=max_pages, transport=transport,
+                                                     raise_errors=raise_errors, progress=progress,
+                                                     summary=summary)]
+        return combine_pages(pages)
+
+
+async def run_batch_async(searches: Dict[str, str], concurrency: int = 10, rate: float = 1.0, burst: int = 1,
+                          max_pages: Optional[int] = None, transport: Optional[AsyncTransport] = None,
+                          backend: Optional[str] = None) -> BatchResult:
+    """
+    Scrape many searches concurrently from one event loop, sharing one transport
+
+    The asynchronous counterpart of run_batch: instead of worker processes, every
+    search runs as a task of the current event loop, and their requests share
+    the transport's connection pool, concurrency limit and rate limiter. A
+    search that fails on any page is recorded in the report with its error and
+    no rows, rather than as a shorter success, and does not abort the batch.
+
+    Args:
+        searches: Dict of search name -> search URL (see load_manifest)
+        concurrency: Maximum number of requests in flight across all searches
+        rate: Maximum requests per second across all searches
+        burst: Maximum requests made back to back across all searches
+        max_pages: Maximum number of pages to scrape per search (None = all pages)
+        transport: Asynchronous HTTP transport to use (None = a new transport from the
+            other arguments, closed when the batch is done)
+        backend: "httpx" or "aiohttp" for the new transport (None = httpx if installed)
+
+    Returns:
+        BatchResult with the de-duplicated properties, search membership and per-search report
+    """
+    if transport is None:
+        async with AsyncTransport(concurrency=concurrency, rate_limiter=AsyncTokenBucket(rate=rate, burst=burst),
+                                  backend=backend) as transport:
+            return await run_batch_async(searches, max_pages=max_pages, transport=transport)
+
+    async def scrape_search(name: str, url: str):
+        start = time.perf_counter()
+        try:
+            df = await scrape_all_pages_async(url, max_pages=max_pages, transport=transport, raise_errors=True)
+            error = None
+        except Exception as e:
+            df, error = pd.DataFrame(), f"{type(e).__name__}: {e}"
+        return name, df, time.perf_counter() - start, error
+
+    outcomes = await asyncio.gather(*(scrape_search(name, url) for name, url in searches.items()))
+    return combine_batch(searches, list(outcomes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many Rightmove searches concurrently with asyncio")
+    parser.add_argument('manifest', help="CSV with url (and optional name) columns, or one URL per line")
+    parser.add_argument('--concurrency', type=int, default=10, help="maximum requests in flight")
+    parser.add_argument('--rate', type=float, default=1.0, help="maximum requests per second across all searches")
+    parser.add_argument('--max-pages', type=int, default=None, help="maximum pages per search")
+    parser.add_argument('--backend', choices=['httpx', 'aiohttp'], default=None, help="async HTTP client")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+
+    searches = load_manifest(args.manifest)
+    print(f"Running {len(searches)} searches, {args.concurrency} requests at a time at {args.rate} requests/s")
+
+    result = asyncio.run(run_batch_async(searches, concurrency=args.concurrency, rate=args.rate,
+                                         max_pages=args.max_pages, backend=args.backend))
+    files = write_batch(result, create_output_folder())
+
+    failed = result.report['error'].notna().sum()
+    print(f"Searches: {len(result.report)} ({failed} failed)")
+    print(f"Unique properties: {len(result.properties)}")
+    for path in files:
+        print(f"Saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Batch Rightmove scraper that runs many searches in parallel worker processes
+Reads a manifest of search URLs and writes one de-duplicated set of properties
+"""
+
+import argparse
+import csv
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from rightmove_webscraper import ProcessTokenBucket, TokenBucket, Transport
+from rightmove_webscraper.listings import apply_schema
+from multi_page_scraper import Checkpoint, create_output_folder, scrape_all_pages
+
+
+@dataclass
+class BatchResult:
+    """Output of a batch run"""
+    properties: pd.DataFrame  # One row per property id, across all searches
+    membership: pd.DataFrame  # (search, id) pairs: which searches returned each property
+    report: pd.DataFrame  # One row per search with its url, rows, seconds and error
+
+
+def load_manifest(manifest_file: Union[str, Path]) -> Dict[str, str]:
+    """
+    Load the searches to run from a manifest file
+
+    The manifest is either a CSV file with a `url` column and an optional `name`
+    column, or a text file with one search URL per line (blank lines and lines
+    starting with # are ignored). Searches without a name are called search_001,
+    search_002, etc.
+
+    Args:
+        manifest_file: Path to the manifest
+
+    Returns:
+        Dict of search name -> search URL, in manifest order
+    """
+    with open(manifest_file, newline='', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    lines = [line for line in lines if line and not line.startswith('#')]
+    if lines and 'url' in next(csv.reader([lines[0]])):
+        rows = [(row.get('name'), row['url']) for row in csv.DictReader(lines)]
+    else:
+        rows = [(None, line) for line in lines]
+    return {name or f"search_{i:03d}": url for i, (name, url) in enumerate(rows, start=1)}
+
+
+# Transport of a worker process, created by _init_worker with the shared rate limiter
+_worker_transport = None
+
+
+def _init_worker(rate_limiter: TokenBucket):
+    global _worker_transport
+    _worker_transport = Transport(rate_limiter=rate_limiter)
+
+
+def _scrape_search(name: str, url: str, max_pages: Optional[int], transport: Optional[Transport] = None,
+                   checkpoint_folder: Optional[Path] = None):
+    """Scrape one search, returning (name, DataFrame, seconds, error) without raising.
+
+    Pages are paced by the transport's rate limiter, shared by the whole batch,
+    instead of a fixed delay per search."""
+    start = time.perf_counter()
+    checkpoint = Checkpoint(checkpoint_folder / name, url) if checkpoint_folder is not None else None
+    try:
+        df = scrape_all_pages(url, max_pages=max_pages, delay=None,
+                              transport=transport or _worker_transport, raise_errors=True, checkpoint=checkpoint)
+        error = None
+    except Exception as e:
+        df, error = pd.DataFrame(), f"{type(e).__name__}: {e}"
+    return name, df, time.perf_counter() - start, error
+
+
+def run_batch(searches: Dict[str, str], processes: int = 4, rate: float = 1.0, burst: int = 1,
+              max_pages: Optional[int] = None, transport: Optional[Transport] = None,
+              checkpoint_folder: Optional[Path] = None) -> BatchResult:
+    """
+    Scrape many searches over a pool of worker processes sharing one rate limit
+
+    A search that fails on any page is recorded in the report with its error and
+    no rows, rather than as a shorter success, and does not abort the batch (with
+    checkpoints, the pages scraped before the error are kept for a rerun).
+
+    Args:
+        searches: Dict of search name -> search URL (see load_manifest)
+        processes: Number of worker processes (1 = run every search in this process)
+        rate: Maximum requests per second across all workers
+        burst: Maximum requests made back to back across all workers
+        max_pages: Maximum number of pages to scrape per search (None = all pages)
+        transport: HTTP transport to use when processes is 1 (None = rate-limited new transport)
+        checkpoint_folder: Optional folder to checkpoint each search's pages in (one
+            subfolder per search name). Running the batch again with the same folder
+            resumes unfinished searches and reuses finished ones' saved pages.
+
+    Returns:
+        BatchResult with the de-duplicated properties, search membership and per-search report
+    """
+    outcomes = []
+    if processes <= 1:
+        transport = transport or Transport(rate_limiter=TokenBucket(rate=rate, burst=burst))
+        for name, url in searches.items():
+            outcomes.append(_scrape_search(name, url, max_pages, transport, checkpoint_folder))
+    else:
+        rate_limiter = ProcessTokenBucket(rate=rate, burst=burst)
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(rate_limiter,)) as executor:
+            futures = [executor.submit(_scrape_search, name, url, max_pages, None, checkpoint_folder)
+                       for name, url in searches.items()]
+            for future in as_completed(futures):
+                outcomes.append(future.result())
+
+    return combine_batch(searches, outcomes)
+
+
+def combine_batch(searches: Dict[str, str], outcomes: list) -> BatchResult:
+    """
+    Report and combine the outcomes of the searches of a batch, in manifest order
+
+    Args:
+        searches: Dict of search name -> search URL
+        outcomes: (name, DataFrame, seconds, error) of every search, in any order
+
+    Returns:
+        BatchResult with the de-duplicated properties, search membership and per-search report
+    """
+    order = {name: i for i, name in enumerate(searches)}
+    outcomes.sort(key=lambda outcome: order[outcome[0]])
+    report = pd.DataFrame([
+        {'search': name, 'url': searches[name], 'rows': len(df), 'seconds': round(seconds, 3), 'error': error}
+        for name, df, seconds, error in outcomes
+    ])
+    frames = [df.assign(search=name) for name, df, _, _ in outcomes if not df.empty]
+    if not frames:
+        return BatchResult(pd.DataFrame(), pd.DataFrame(columns=['search', 'id']), report)
+    combined = apply_schema(pd.concat(frames, ignore_index=True))
+    membership = combined[['search', 'id']].drop_duplicates(ignore_index=True)
+    properties = combined.drop(columns='search').drop_duplicates(subset=['id'], keep='first', ignore_index=True)
+    return BatchResult(properties, membership, report)
+
+
+def write_batch(result: BatchResult, output_folder: Path) -> List[Path]:
+    """
+    Save a batch run as properties.csv, membership.csv and report.csv
+
+    Args:
+        result: Output of run_batch
+        output_folder: Folder to save the files in
+
+    Returns:
+        Paths of the saved files
+    """
+    files = []
+    for name, df in [('properties', result.properties), ('membership', result.membership),
+                     ('report', result.report)]:
+        path = output_folder / f"{name}.csv"
+        df.to_csv(path, index=False)
+        files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many Rightmove searches in parallel")
+    parser.add_argument('manifest', help="CSV with url (and optional name) columns, or one URL per line")
+    parser.add_argument('--processes', type=int, default=4, help="number of worker processes")
+    parser.add_argument('--rate', type=float, default=1.0, help="maximum requests per second across all workers")
+    parser.add_argument('--max-pages', type=int, default=None, help="maximum pages per search")
+    parser.add_argument('--resume', default=None, help="run folder of an interrupted batch to resume")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+
+    searches = load_manifest(args.manifest)
+    print(f"Running {len(searches)} searches over {args.processes} processes at {args.rate} requests/s")
+
+    output_folder = Path(args.resume) if args.resume else create_output_folder()
+    result = run_batch(searches, processes=args.processes, rate=args.rate, max_pages=args.max_pages,
+                       checkpoint_folder=output_folder / 'checkpoints')
+    files = write_batch(result, output_folder)
+
+    print("\n" + "=" * 80)
+    print("BATCH REPORT")
+    print("=" * 80)
+    print(result.report.to_string(index=False))
+    failed = result.report['error'].notna().sum()
+    print(f"\nSearches: {len(result.report)} ({failed} failed)")
+    print(f"Unique properties: {len(result.properties)}")
+    for path in files:
+        print(f"Saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
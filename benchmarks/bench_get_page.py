@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark of RightmoveData._get_page over saved results pages.
+
+Times the per-page parse of the saved rent and sale fixtures with the compiled
+class-level Xpaths used by `_get_page`, against the previous implementation
+which re-evaluated the weblink and agent Xpaths for every element and resolved
+`rent_or_sale` from the URL on every page.
+
+Usage:
+    python benchmarks/bench_get_page.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from lxml import html
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.offline import URLS, OfflineRightmoveData, read_fixture
+
+
+def rent_or_sale(url: str):
+    """The previous `rent_or_sale` property, evaluated on every page."""
+    if "/property-for-sale/" in url or "/new-homes-for-sale/" in url:
+        return "sale"
+    elif "/property-to-rent/" in url:
+        return "rent"
+    elif "/commercial-property-for-sale/" in url:
+        return "sale-commercial"
+    elif "/commercial-property-to-let/" in url:
+        return "rent-commercial"
+    raise ValueError(url)
+
+
+def get_page_previous(url: str, request_content: bytes):
+    """The previous `_get_page` Xpath evaluation."""
+    tree = html.fromstring(request_content)
+    if "rent" in rent_or_sale(url):
+        xp_prices = """//span[@class="propertyCard-priceValue"]/text()"""
+    else:
+        xp_prices = """//div[@class="propertyCard-priceValue"]/text()"""
+    xp_titles = """//div[@class="propertyCard-details"]\
+        //a[@class="propertyCard-link"]\
+        //h2[@class="propertyCard-title"]/text()"""
+    xp_addresses = """//address[@class="propertyCard-address"]//span/text()"""
+    xp_weblinks = """//div[@class="propertyCard-details"]//a[@class="propertyCard-link"]/@href"""
+    xp_agent_urls = """//div[@class="propertyCard-contactsItem"]\
+        //div[@class="propertyCard-branchLogo"]\
+        //a[@class="propertyCard-branchLogo-link"]/@href"""
+    price_pcm = tree.xpath(xp_prices)
+    titles = tree.xpath(xp_titles)
+    addresses = tree.xpath(xp_addresses)
+    base = "http://www.rightmove.co.uk"
+    weblinks = [f"{base}{tree.xpath(xp_weblinks)[w]}" for w in range(len(tree.xpath(xp_weblinks)))]
+    agent_urls = [f"{base}{tree.xpath(xp_agent_urls)[a]}" for a in range(len(tree.xpath(xp_agent_urls)))]
+    return price_pcm, titles, addresses, weblinks, agent_urls
+
+
+def timeit(func, *args, number: int = 200, repeat: int = 5) -> float:
+    """Best mean wall-clock time of one call in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main():
+    print(f"{'fixture':>8} {'previous (ms)':>14} {'current (ms)':>13} {'speed-up':>9}")
+    for mode, url in URLS.items():
+        content = read_fixture(f"legacy_{mode}_page.html")
+        rm = OfflineRightmoveData(url, content)
+        previous = timeit(get_page_previous, url, content)
+        current = timeit(rm._get_page, content)
+        print(f"{mode:>8} {previous * 1e3:>14.3f} {current * 1e3:>13.3f} {previous / current:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
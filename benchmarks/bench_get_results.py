@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of how RightmoveData._get_results accumulates results pages.
+
+Compares the column buffers used by `_get_results` with the previous approach
+of building one DataFrame per page and concatenating it onto the accumulated
+results, for increasing page counts. Per-page cost should stay flat for the
+column buffers (linear scaling) and grow with the page count for concat.
+
+Usage:
+    python benchmarks/bench_get_results.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.offline import URLS, OfflineRightmoveData
+
+
+def accumulate_concat(pages):
+    """The previous approach: concatenate a DataFrame per page in a loop."""
+    results = pd.DataFrame(pages[0]).astype(object)
+    for page in pages[1:]:
+        results = pd.concat([results, pd.DataFrame(page).astype(object)])
+    return results
+
+
+def accumulate_buffers(pages):
+    """The current approach: extend column lists and build one DataFrame."""
+    columns = {c: list(v) for c, v in pages[0].items()}
+    for page in pages[1:]:
+        for column, values in page.items():
+            columns[column].extend(values)
+    return pd.DataFrame(columns)
+
+
+def timeit(func, *args, repeat: int = 3) -> float:
+    """Best wall-clock time of `repeat` calls in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rm = OfflineRightmoveData(URLS["rent"])
+    page = rm._get_page(rm.content)
+
+    print(f"{'pages':>6} {'concat (ms)':>12} {'per page':>10} {'buffers (ms)':>13} {'per page':>10}")
+    for n_pages in (42, 84, 168, 336, 672):
+        pages = [page] * n_pages
+        concat = timeit(accumulate_concat, pages)
+        buffers = timeit(accumulate_buffers, pages)
+        print(f"{n_pages:>6} {concat * 1e3:>12.2f} {concat * 1e6 / n_pages:>8.1f}us "
+              f"{buffers * 1e3:>13.2f} {buffers * 1e6 / n_pages:>8.1f}us")
+
+    full = timeit(rm._get_results)
+    print(f"\nFull _get_results over {rm.page_count + 1} saved pages: {full * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
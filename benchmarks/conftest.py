@@ -0,0 +1,57 @@
+"""
+Fixtures for the benchmark suite: recorded pages, a local mock Rightmove
+server, and synthetic frames scaled up from the recorded pages.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rightmove_webscraper import Transport
+from rightmove_webscraper.listings import normalise_listings
+from rightmove_webscraper.mock_server import MockRightmoveServer
+from rightmove_webscraper.nextdata import extract_search_results
+from benchmarks import offline
+
+PAGES = 42
+
+
+@pytest.fixture(scope="session")
+def pages():
+    """Number of pages of the scraped searches."""
+    return PAGES
+
+
+@pytest.fixture(scope="session")
+def read_fixture():
+    """Function reading a recorded page from benchmarks/fixtures."""
+    return offline.read_fixture
+
+
+@pytest.fixture(scope="session")
+def mock_server():
+    """Base URL of a local mock Rightmove server with exactly `pages` pages of
+    results per search."""
+    with MockRightmoveServer(results=24 * PAGES) as server:
+        yield server.url
+
+
+@pytest.fixture
+def transport():
+    """Transport without a rate limit or retry delays."""
+    with Transport(backoff_factor=0) as transport:
+        yield transport
+
+
+@pytest.fixture(scope="session")
+def merged_frame():
+    """100k listings, as if merged from many searches, built by repeating the
+    recorded page with fresh ids and varied prices."""
+    page = normalise_listings(extract_search_results(offline.read_fixture("next_rent_page.html"))["properties"])
+    repeats = 100_000 // len(page) + 1
+    df = pd.concat([page] * repeats, ignore_index=True).iloc[:100_000]
+    rng = np.random.default_rng(0)
+    df["id"] = np.arange(len(df))
+    df["price"] = df["price"] + rng.integers(-200, 200, len(df))
+    df["bedrooms"] = rng.integers(0, 5, len(df))
+    return df
@@ -0,0 +1,29 @@
+"""
+Helpers shared by the benchmarks: the recorded pages in benchmarks/fixtures,
+and a RightmoveData which serves them instead of making requests.
+"""
+
+from pathlib import Path
+
+from rightmove_webscraper import RightmoveData
+
+FIXTURES = Path(__file__).parent / "fixtures"
+URLS = {
+    "rent": "https://www.rightmove.co.uk/property-to-rent/find.html?searchType=RENT&locationIdentifier=REGION%5E94346",
+    "sale": "https://www.rightmove.co.uk/property-for-sale/find.html?searchType=SALE&locationIdentifier=REGION%5E94346",
+}
+
+
+def read_fixture(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+class OfflineRightmoveData(RightmoveData):
+    """RightmoveData serving a recorded results page (`content`, by default
+    the legacy rent page) for every request."""
+    def __init__(self, url: str, content: bytes = None, **kwargs):
+        self.content = content if content is not None else read_fixture("legacy_rent_page.html")
+        super().__init__(url, **kwargs)
+
+    def _request(self, url: str):
+        return 200, self.content
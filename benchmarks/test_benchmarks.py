@@ -0,0 +1,96 @@
+"""
+Benchmarks of the parse, clean and report hot paths, driven by the recorded
+pages in benchmarks/fixtures and the local mock server, so no network is used.
+
+Usage:
+    python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+`--benchmark-autosave` stores each run's results in .benchmarks/, and
+`--benchmark-compare` compares against the latest stored run (failing when a
+benchmark's mean is more than 10% slower), to catch regressions between versions.
+"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from rightmove_webscraper import RightmoveData  # noqa: E402
+from rightmove_webscraper.listings import normalise_listings  # noqa: E402
+from rightmove_webscraper import nextdata  # noqa: E402
+from rightmove_webscraper.nextdata import extract_search_results  # noqa: E402
+from rightmove_webscraper.stats import PriceStats  # noqa: E402
+from multi_page_scraper import generate_full_statistics, scrape_all_pages, scrape_rightmove_page  # noqa: E402
+from benchmarks.offline import URLS, OfflineRightmoveData  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def offline_rm():
+    return OfflineRightmoveData(URLS["rent"])
+
+
+@pytest.mark.parametrize("kind", ["rent", "sale"])
+def test_get_page(benchmark, kind, read_fixture):
+    content = read_fixture(f"legacy_{kind}_page.html")
+    rm = OfflineRightmoveData.__new__(OfflineRightmoveData)
+    rm._url, rm._first_page = URLS[kind], b""
+    rm._set_rent_or_sale()
+    page = benchmark(rm._get_page, content)
+    assert len(page["price"]) == 24
+
+
+def test_clean_results_42_pages(benchmark, offline_rm, pages):
+    page = offline_rm._get_page(offline_rm.content)
+    columns = {c: v * pages for c, v in page.items()}
+    results = benchmark(lambda: offline_rm._clean_results(pd.DataFrame(columns)))
+    assert len(results) == 24 * pages
+
+
+@pytest.mark.parametrize("parser", ["orjson", "json"])
+def test_extract_search_results(benchmark, read_fixture, monkeypatch, parser):
+    # orjson parses the whole payload, json only the searchResults subtree
+    if parser == "json":
+        monkeypatch.setattr(nextdata, "orjson", None)
+    elif nextdata.orjson is None:
+        pytest.skip("orjson not installed")
+    content = read_fixture("next_rent_page.html")
+    assert len(benchmark(extract_search_results, content)["properties"]) == 24
+
+
+def test_normalise_listings(benchmark, read_fixture):
+    properties = extract_search_results(read_fixture("next_rent_page.html"))["properties"]
+    assert len(benchmark(normalise_listings, properties)) == 24
+
+
+def test_scrape_rightmove_page(benchmark, mock_server, transport):
+    url = f"{mock_server}/property-to-rent/find.html?locationIdentifier=REGION%5E92828"
+    df, _ = benchmark(scrape_rightmove_page, url, transport)
+    assert len(df) == 24
+
+
+def test_price_stats_100k(benchmark, merged_frame):
+    def breakdowns():
+        stats = PriceStats(merged_frame)
+        return [stats.by(c) for c in ["bedrooms", "postcode", "property_type", "bathrooms", "branch"]]
+    benchmark(breakdowns)
+
+
+def test_generate_full_statistics_100k(benchmark, merged_frame, tmp_path):
+    stats_file = benchmark(generate_full_statistics, merged_frame, tmp_path, {"Location": "Benchmark"})
+    assert stats_file.exists()
+
+
+def test_pipeline_scrape_all_pages(benchmark, mock_server, transport, pages):
+    url = f"{mock_server}/property-to-rent/find.html?locationIdentifier=REGION%5E92828"
+    df = benchmark.pedantic(scrape_all_pages, args=(url,), kwargs={"delay": 0, "transport": transport},
+                            rounds=3)
+    assert len(df) == 24 * pages
+
+
+@pytest.mark.parametrize("max_workers", [1, 8])
+def test_pipeline_rightmove_data(benchmark, mock_server, transport, pages, max_workers):
+    url = f"{mock_server}/property-to-rent/find.html?format=legacy&locationIdentifier=REGION%5E92828"
+    rm = benchmark.pedantic(RightmoveData, args=(url,),
+                            kwargs={"transport": transport, "max_workers": max_workers}, rounds=3)
+    assert rm.results_count == 24 * pages
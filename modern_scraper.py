@@ -4,85 +4,49 @@ Modern Rightmove scraper that works with the current website structure (2025)
 The site now uses Next.js and embeds property data as JSON in the page
 """
 
-import requests
-import json
-import re
+import logging
+
 import pandas as pd
-from datetime import datetime
 
+from rightmove_webscraper import default_transport
+from rightmove_webscraper.listings import normalise_listings
+from rightmove_webscraper.nextdata import extract_search_results
+
+logger = logging.getLogger(__name__)
 
-def scrape_rightmove(url):
+
+def scrape_rightmove(url, transport=None):
     """
     Scrape Rightmove property data from the new Next.js-based site
 
     Args:
         url: Rightmove search results URL
+        transport: HTTP transport to make the request with (None = shared default)
 
     Returns:
         pandas.DataFrame with property listings
     """
-    print(f"Fetching: {url}")
-    r = requests.get(url)
+    logger.info('Fetching: %s', url)
+    transport = transport or default_transport()
+    r = transport.get(url)
 
     if r.status_code != 200:
         raise Exception(f"Failed to fetch page. Status code: {r.status_code}")
 
-    # Extract JSON data from Next.js script tag
-    pattern = r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>'
-    matches = re.findall(pattern, r.text, re.DOTALL)
-
-    if not matches:
-        raise Exception("Could not find property data in page")
-
-    data = json.loads(matches[0])
-
-    # Navigate to property data
-    search_results = data['props']['pageProps']['searchResults']
+    # Extract property data from the Next.js __NEXT_DATA__ script tag
+    search_results = extract_search_results(r.content)
     properties = search_results.get('properties', [])
     result_count = search_results.get('resultCount', 'N/A')
 
-    print(f"Found {len(properties)} properties on this page")
-    print(f"Total results available: {result_count}")
+    logger.info('Found %d properties on this page', len(properties))
+    logger.info('Total results available: %s', result_count)
 
     if not properties:
-        print("No properties found!")
+        logger.warning('No properties found')
         return pd.DataFrame()
 
-    # Extract relevant fields from each property
-    extracted_data = []
-    for prop in properties:
-        property_data = {
-            'id': prop.get('id'),
-            'price': prop.get('price', {}).get('amount'),
-            'price_display': prop.get('price', {}).get('displayPrices', [{}])[0].get('displayPrice'),
-            'frequency': prop.get('price', {}).get('frequency'),
-            'property_type': prop.get('propertySubType'),
-            'bedrooms': prop.get('bedrooms'),
-            'bathrooms': prop.get('bathrooms'),
-            'address': prop.get('displayAddress'),
-            'summary': prop.get('summary'),
-            'property_url': f"https://www.rightmove.co.uk{prop.get('propertyUrl', '')}",
-            'contact_url': prop.get('contactUrl'),
-            'branch': prop.get('customer', {}).get('branchDisplayName'),
-            'branch_id': prop.get('customer', {}).get('branchId'),
-            'added_or_reduced': prop.get('addedOrReduced'),
-            'first_visible_date': prop.get('firstVisibleDate'),
-            'let_type': prop.get('letType'),
-            'postcode': None,  # Will extract from address
-            'search_date': datetime.now().isoformat()
-        }
-
-        # Extract postcode from address if possible
-        if property_data['address']:
-            # UK postcode pattern (simplified)
-            postcode_match = re.search(r'\b([A-Z]{1,2}[0-9][A-Z0-9]?)\b', property_data['address'])
-            if postcode_match:
-                property_data['postcode'] = postcode_match.group(1)
-
-        extracted_data.append(property_data)
-
-    # Convert to DataFrame
-    df = pd.DataFrame(extracted_data)
+    # Convert the properties to a DataFrame, one column at a time
+    df = normalise_listings(properties)
 
     return df, search_results
 
@@ -91,6 +55,8 @@ def main():
     # Your search URL
     url = "https://www.rightmove.co.uk/property-to-rent/find.html?searchLocation=South+East+London&useLocationIdentifier=true&locationIdentifier=REGION%5E92828&rent=To+rent&radius=0.0&_includeLetAgreed=on&maxPrice=1500&index=0&sortType=6&channel=RENT&transactionType=LETTING&displayLocationIdentifier=South-East-London.html&maxBedrooms=2&dontShow=houseShare%2Cretirement%2Cstudent&minPrice=600"
 
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     print("=" * 80)
     print("Modern Rightmove Scraper - South East London Rentals")
     print("=" * 80)
@@ -127,7 +93,7 @@ def main():
         print("\n" + "=" * 80)
         print("BY NUMBER OF BEDROOMS")
         print("=" * 80)
-        bedroom_summary = df.groupby('bedrooms').agg({
+        bedroom_summary = df.groupby('bedrooms', observed=True).agg({
             'price': ['count', 'mean', 'min', 'max']
         }).round(0)
         bedroom_summary.columns = ['Count', 'Avg Price', 'Min Price', 'Max Price']
@@ -138,7 +104,7 @@ def main():
         print("\n" + "=" * 80)
         print("TOP 10 POSTCODES")
         print("=" * 80)
-        postcode_summary = df.dropna(subset=['postcode']).groupby('postcode').agg({
+        postcode_summary = df.dropna(subset=['postcode']).groupby('postcode', observed=True).agg({
             'price': ['count', 'mean']
         }).round(0)
         postcode_summary.columns = ['Count', 'Avg Price']
@@ -156,11 +122,11 @@ def main():
             print(f"   Bedrooms: {int(row['bedrooms'])}")
         if pd.notna(row['price']):
             print(f"   Rent: £{int(row['price']):,} pcm")
-        elif row['price_display']:
+        elif pd.notna(row['price_display']):
             print(f"   Rent: {row['price_display']}")
-        if row['added_or_reduced']:
+        if pd.notna(row['added_or_reduced']):
             print(f"   Status: {row['added_or_reduced']}")
-        if row['branch']:
+        if pd.notna(row['branch']):
             print(f"   Agent: {row['branch']}")
         print(f"   URL: {row['property_url']}")
 
@@ -4,188 +4,495 @@ Multi-page Rightmove scraper that collects ALL results from a search
 Works with the current Next.js-based Rightmove website (2025)
 """
 
-import requests
 import json
+import logging
 import re
+import time
 import pandas as pd
+from dataclasses import dataclass
 from datetime import datetime
-import time
 import os
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Callable, Iterable, Iterator, Tuple, Optional, Union
+
+from rightmove_webscraper import (ListingStore, ParquetStore, ResponseCache, TokenBucket, Transport,
+                                  default_transport, shared_metrics, shared_rate_limiter)
+from rightmove_webscraper.cache import normalise_url
+from rightmove_webscraper.listings import apply_schema, normalise_listings
+from rightmove_webscraper.nextdata import extract_search_results
+from rightmove_webscraper.stats import PriceStats
+
+logger = logging.getLogger(__name__)
 
 
-def scrape_rightmove_page(url: str) -> Tuple[pd.DataFrame, dict]:
+def scrape_rightmove_page(url: str, transport: Optional[Transport] = None,
+                          summary: bool = True) -> Tuple[pd.DataFrame, dict]:
     """
     Scrape a single page of Rightmove property data
 
     Args:
         url: Rightmove search results URL
+        transport: HTTP transport to make the request with (None = shared default)
+        summary: Keep the long summary text of each listing (False = drop it to save memory)
 
     Returns:
         Tuple of (DataFrame with property listings, search_results dict)
     """
-    r = requests.get(url)
+    transport = transport or default_transport()
+    with shared_metrics().timer('fetch'):
+        r = transport.get(url)
 
     if r.status_code != 200:
         raise Exception(f"Failed to fetch page. Status code: {r.status_code}")
 
-    # Extract JSON data from Next.js script tag
-    pattern = r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>'
-    matches = re.findall(pattern, r.text, re.DOTALL)
+    return parse_rightmove_page(r.content, summary=summary)
 
-    if not matches:
-        raise Exception("Could not find property data in page")
 
-    data = json.loads(matches[0])
+def parse_rightmove_page(content: bytes, summary: bool = True) -> Tuple[pd.DataFrame, dict]:
+    """
+    Parse the HTML of a page of Rightmove search results
+
+    Args:
+        content: HTML of the page
+        summary: Keep the long summary text of each listing (False = drop it to save memory)
 
-    # Navigate to property data
-    search_results = data['props']['pageProps']['searchResults']
+    Returns:
+        Tuple of (DataFrame with property listings, search_results dict)
+    """
+    metrics = shared_metrics()
+    # Extract property data from the Next.js __NEXT_DATA__ script tag
+    with metrics.timer('parse_page'):
+        search_results = extract_search_results(content)
     properties = search_results.get('properties', [])
+    metrics.count('pages_parsed')
 
     if not properties:
         return pd.DataFrame(), search_results
 
-    # Extract relevant fields from each property
-    extracted_data = []
-    for prop in properties:
-        property_data = {
-            'id': prop.get('id'),
-            'price': prop.get('price', {}).get('amount'),
-            'price_display': prop.get('price', {}).get('displayPrices', [{}])[0].get('displayPrice'),
-            'frequency': prop.get('price', {}).get('frequency'),
-            'property_type': prop.get('propertySubType'),
-            'bedrooms': prop.get('bedrooms'),
-            'bathrooms': prop.get('bathrooms'),
-            'address': prop.get('displayAddress'),
-            'summary': prop.get('summary'),
-            'property_url': f"https://www.rightmove.co.uk{prop.get('propertyUrl', '')}",
-            'contact_url': prop.get('contactUrl'),
-            'branch': prop.get('customer', {}).get('branchDisplayName'),
-            'branch_id': prop.get('customer', {}).get('branchId'),
-            'added_or_reduced': prop.get('addedOrReduced'),
-            'first_visible_date': prop.get('firstVisibleDate'),
-            'let_type': prop.get('letType'),
-            'postcode': None,  # Will extract from address
-            'search_date': datetime.now().isoformat()
-        }
-
-        # Extract postcode from address if possible
-        if property_data['address']:
-            # UK postcode pattern (simplified)
-            postcode_match = re.search(r'\b([A-Z]{1,2}[0-9][A-Z0-9]?)\b', property_data['address'])
-            if postcode_match:
-                property_data['postcode'] = postcode_match.group(1)
-
-        extracted_data.append(property_data)
-
-    # Convert to DataFrame
-    df = pd.DataFrame(extracted_data)
+    # Convert the properties to a DataFrame, one column at a time
+    with metrics.timer('build_frame'):
+        df = normalise_listings(properties, summary=summary)
+    metrics.count('rows', len(df))
 
     return df, search_results
 
 
-def scrape_all_pages(base_url: str, max_pages: Optional[int] = None, delay: float = 1.0) -> pd.DataFrame:
+def clean_search_url(base_url: str) -> str:
+    """Search URL without its page index, ready for an `&index=` parameter to be appended"""
+    clean_url = re.sub(r'&index=\d+', '', base_url)
+    if not clean_url.endswith('?') and '?' not in clean_url.split('/')[-1]:
+        if '&' in clean_url:
+            clean_url = clean_url  # Already has parameters
+        else:
+            clean_url += '?'
+    return clean_url
+
+
+# Columns compared to decide whether an already-seen listing has changed
+CHANGE_COLUMNS = ['price', 'added_or_reduced']
+
+
+def load_known_listings(csv_file: Union[str, Path]) -> pd.DataFrame:
     """
-    Scrape all pages of results from a Rightmove search
+    Load the listings of a previous run for incremental scraping
 
     Args:
-        base_url: Base search URL (without index parameter)
-        max_pages: Maximum number of pages to scrape (None = all pages)
-        delay: Delay in seconds between requests to be polite to the server
+        csv_file: properties.csv written by a previous run
 
     Returns:
-        DataFrame containing all properties from all pages
+        DataFrame with the id and change-tracking columns of each listing
     """
-    all_properties = []
-    page_num = 0
-    index = 0
+    df = pd.read_csv(csv_file)
+    return df[['id'] + [c for c in CHANGE_COLUMNS if c in df.columns]]
 
-    print("=" * 80)
-    print("Multi-Page Rightmove Scraper")
-    print("=" * 80)
 
-    # First page
-    print(f"\nFetching page {page_num + 1}...")
+def _prepare_known(known: Union[Iterable, pd.DataFrame]) -> Tuple[set, Optional[pd.DataFrame]]:
+    """Split `known` into a set of IDs and, for DataFrames, the last known
+    state of each listing indexed by id."""
+    if isinstance(known, pd.DataFrame):
+        state = known.drop_duplicates(subset=['id'], keep='last').set_index('id')
+        state = state[[c for c in CHANGE_COLUMNS if c in state.columns]]
+        return set(state.index), state if len(state.columns) else None
+    return set(known), None
 
-    # Remove existing index parameter if present and clean up URL
-    clean_url = re.sub(r'&index=\d+', '', base_url)
-    if not clean_url.endswith('?') and '?' not in clean_url.split('/')[-1]:
-        if '&' in clean_url:
-            clean_url = clean_url  # Already has parameters
-        else:
-            clean_url += '?'
 
+def filter_new_or_changed(df: pd.DataFrame, known_ids: set,
+                          known_state: Optional[pd.DataFrame] = None) -> Tuple[pd.DataFrame, bool]:
+    """
+    Keep only the listings of a page which are new, or whose price or status
+    changed since they were last seen
+
+    Args:
+        df: DataFrame of one page of listings
+        known_ids: IDs of listings already seen
+        known_state: Optional last known CHANGE_COLUMNS of each listing, indexed by id
+
+    Returns:
+        Tuple of (new or changed listings, whether every listing on the page was already known)
+    """
+    is_known = df['id'].isin(known_ids)
+    keep = ~is_known
+    if known_state is not None:
+        previous = known_state.reindex(df['id'])
+        for column in known_state.columns:
+            before = previous[column].reset_index(drop=True)
+            now = df[column].reset_index(drop=True)
+            # Comparisons with a missing value (NA for nullable columns) count as changed
+            unchanged = ((now == before) | (now.isna() & before.isna())).fillna(False)
+            keep |= is_known & ~unchanged.to_numpy(dtype=bool)
+    return df[keep], bool(is_known.all())
+
+
+class Checkpoint:
+    """
+    Progress of a search scrape saved in its run folder, so that a scrape which
+    is interrupted can be resumed from its last completed page
+
+    The rows of each completed page are pickled to checkpoint_pages/<index>.pkl
+    and checkpoint.json records the search URL, the completed page indexes, the
+    pagination of the search and whether the scrape finished. Both are written
+    atomically after every page. The pages of a finished scrape are kept, so
+    scraping again with the same checkpoint replays them without requests.
+    """
+    def __init__(self, folder: Union[str, Path], url: str):
+        """
+        Args:
+            folder: Run folder to save the checkpoint in (e.g. from create_output_folder)
+            url: Search URL being scraped. A checkpoint of a different search in
+                the same folder is discarded.
+        """
+        self.folder = Path(folder)
+        self.file = self.folder / 'checkpoint.json'
+        self.pages_folder = self.folder / 'checkpoint_pages'
+        self.url = _search_key(url)
+        state = _read_checkpoint(self.file)
+        if state is None or state['url'] != self.url:
+            state = {'url': self.url, 'pages': [], 'total_pages': None, 'result_count': None, 'complete': False}
+        self.state = state
+
+    @property
+    def pages(self) -> list:
+        """Completed page indexes, in order"""
+        return sorted(self.state['pages'])
+
+    @property
+    def complete(self) -> bool:
+        return self.state['complete']
+
+    def load(self, index: int) -> pd.DataFrame:
+        """Rows of a completed page"""
+        return pd.read_pickle(self.pages_folder / f"{index}.pkl")
+
+    def save(self, index: int, df: pd.DataFrame, **pagination):
+        """Record a completed page and its rows, with any pagination info of the search"""
+        self.pages_folder.mkdir(parents=True, exist_ok=True)
+        path = self.pages_folder / f"{index}.pkl"
+        df.to_pickle(path.with_suffix('.tmp'))
+        os.replace(path.with_suffix('.tmp'), path)
+        self.state['pages'] = sorted(set(self.state['pages']) | {index})
+        self.state.update(pagination)
+        self._write()
+
+    def finish(self):
+        """Mark the scrape as complete"""
+        self.state['complete'] = True
+        self._write()
+
+    def _write(self):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        tmp = self.file.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.state, indent=2), encoding='utf-8')
+        os.replace(tmp, self.file)
+
+
+def _search_key(url: str) -> str:
+    """Search URL without its page index, normalised to compare checkpoints"""
+    return normalise_url(re.sub(r'&?index=\d+', '', url))
+
+
+def _read_checkpoint(file: Path) -> Optional[dict]:
     try:
-        df, search_results = scrape_rightmove_page(clean_url)
+        return json.loads(file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def find_checkpoint(url: str, results_dir: Union[str, Path] = 'results') -> Optional[Path]:
+    """
+    Find the run folder of the latest unfinished scrape of a search
+
+    Args:
+        url: Search URL
+        results_dir: Folder containing the run folders
+
+    Returns:
+        Path of the run folder, or None if no unfinished scrape of the search was found
+    """
+    key = _search_key(url)
+    files = sorted(Path(results_dir).glob('*/checkpoint.json'), key=lambda f: f.stat().st_mtime, reverse=True)
+    for file in files:
+        state = _read_checkpoint(file)
+        if state and state.get('url') == key and not state.get('complete') and state.get('pages'):
+            return file.parent
+    return None
+
+
+@dataclass
+class PageProgress:
+    """Progress of a search, passed to the progress callback after each page"""
+    page: int  # Number of the page just scraped, from 1
+    pages: int  # Number of pages to scrape (as far as known so far)
+    rows: int  # Listings yielded for this page
+    total_rows: int  # Listings yielded so far
+    elapsed: float  # Seconds since the scrape started
+    eta: Optional[float]  # Estimated seconds until the last page, if any page was fetched
+    result_count: Optional[str] = None  # Total results of the search, as shown by Rightmove
+    resumed: bool = False  # Whether the page was replayed from a checkpoint
+
+
+def iter_pages(base_url: str, max_pages: Optional[int] = None, delay: Optional[float] = 1.0,
+               transport: Optional[Transport] = None,
+               known: Optional[Union[Iterable, pd.DataFrame]] = None,
+               raise_errors: bool = False, checkpoint: Optional[Checkpoint] = None,
+               progress: Optional[Callable[[PageProgress], None]] = None,
+               summary: bool = True) -> Iterator[pd.DataFrame]:
+    """
+    Scrape the pages of results of a Rightmove search one at a time
+
+    Each page's listings are yielded as soon as the page is parsed, and the next
+    page is only requested once the consumer asks for it, so a slow consumer
+    (e.g. writing to a store) paces the scrape instead of pages piling up in
+    memory. A listing which moves between pages while the search is scraped can
+    be yielded twice (see iter_listings).
+
+    Args:
+        base_url: Base search URL (without index parameter)
+        max_pages: Maximum number of pages to scrape (None = all pages)
+        delay: Minimum interval in seconds between the starts of this search's page
+            requests, to be polite to the server (None or 0 = no interval). Time spent
+            waiting for a response counts towards it. All requests are also paced by
+            the transport's rate limiter, if it has one (e.g. the process-wide
+            shared_rate_limiter(); the shared default transport has none)
+        transport: HTTP transport shared by all page requests (None = shared default)
+        known: Optional IDs of listings already seen, or a DataFrame of them with
+            id, price and added_or_reduced columns (see load_known_listings).
+            Only new or changed listings are yielded, and paging stops after the
+            first page made up entirely of known listings, so searches sorted by
+            newest (sortType=6) usually only need one or two pages.
+        raise_errors: Raise the error if any page can't be scraped, instead of
+            logging it and stopping (after the first page, with the pages yielded
+            so far as the only results)
+        checkpoint: Optional Checkpoint to save every completed page to. Pages it
+            already has (up to max_pages) are yielded from it without requests, and
+            unless it is complete or max_pages is reached scraping resumes after its
+            last completed page.
+        progress: Optional callback called with a PageProgress after each page,
+            before the page is yielded. Pages, errors and stops are also logged to
+            this module's logger (per-page lines at DEBUG level).
+        summary: Keep the long summary text of each listing (False = drop it to save memory)
+
+    Yields:
+        DataFrame of the listings of each page, in page order
+    """
+    known_ids, known_state = _prepare_known(known) if known is not None else (None, None)
+    pacer = TokenBucket(rate=1 / delay, burst=1) if delay else None
+    start = time.perf_counter()
+    fetched = 0
+    total_rows = 0
+    result_count = None
+
+    def report(page_num: int, pages: int, rows: int, resumed: bool = False):
+        nonlocal total_rows
+        total_rows += rows
+        logger.debug('Page %d/%d: %d properties', page_num + 1, pages, rows)
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            eta = elapsed / fetched * (pages - page_num - 1) if fetched else None
+            progress(PageProgress(page_num + 1, pages, rows, total_rows, elapsed, eta, result_count, resumed))
+
+    logger.info('Scraping %s', base_url)
+
+    # Remove existing index parameter if present and clean up URL
+    clean_url = clean_search_url(base_url)
+
+    resumed = checkpoint.pages if checkpoint is not None else []
+    if resumed:
+        # Replay the completed pages of an earlier scrape
+        logger.info('Resuming from checkpoint: %d pages already scraped', len(resumed))
+        total_pages = checkpoint.state['total_pages']
+        pages_to_scrape = min(max_pages, total_pages) if max_pages else total_pages
+        result_count = checkpoint.state.get('result_count')
+        resumed = [index for index in resumed if index // 24 < pages_to_scrape]
+        for index in resumed:
+            df = checkpoint.load(index)
+            report(index // 24, pages_to_scrape, len(df), resumed=True)
+            yield df
+        first_page = resumed[-1] // 24 + 1 if resumed else 0
+        if checkpoint.complete or first_page >= pages_to_scrape:
+            return
+    else:
+        try:
+            if pacer:
+                pacer.acquire()
+            df, search_results = scrape_rightmove_page(clean_url, transport=transport, summary=summary)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error('Error scraping first page: %s', e)
+            return
+        fetched += 1
 
         if df.empty:
-            print("No properties found!")
-            return pd.DataFrame()
+            logger.warning('No properties found')
+            if checkpoint is not None:
+                checkpoint.finish()
+            return
 
-        all_properties.append(df)
+        all_known = False
+        if known_ids is not None:
+            page_count = len(df)
+            df, all_known = filter_new_or_changed(df, known_ids, known_state)
+            logger.debug('Page 1: %d new or changed of %d', len(df), page_count)
 
         # Get pagination info
         pagination = search_results.get('pagination', {})
         total_pages = pagination.get('total', 1)
         result_count = search_results.get('resultCount', 'Unknown')
 
-        print(f"✓ Page 1: {len(df)} properties")
-        print(f"Total results available: {result_count}")
-        print(f"Total pages available: {total_pages}")
+        logger.info('Total results available: %s (%d pages)', result_count, total_pages)
+        if checkpoint is not None:
+            checkpoint.save(0, df, total_pages=total_pages, result_count=result_count)
+        if all_known:
+            logger.info('All properties on page 1 already known, stopping')
+            total_pages = 1
 
         # Determine how many pages to scrape
         pages_to_scrape = min(max_pages, total_pages) if max_pages else total_pages
+        report(0, pages_to_scrape, len(df))
+        yield df
+        first_page = 1
+
+    if pages_to_scrape > first_page:
+        logger.info('Scraping %d more pages', pages_to_scrape - first_page)
+
+    # Scrape remaining pages
+    for page_num in range(first_page, pages_to_scrape):
+        if pacer:
+            pacer.acquire()  # Be polite to the server
+
+        index = page_num * 24  # Rightmove uses 24 results per page
+        page_url = f"{clean_url}&index={index}"
+
+        try:
+            df, _ = scrape_rightmove_page(page_url, transport=transport, summary=summary)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.warning('Error scraping page %d, stopping at page %d: %s', page_num + 1, page_num, e)
+            return
+        fetched += 1
 
-        if pages_to_scrape > 1:
-            print(f"\nScraping {pages_to_scrape - 1} more pages...")
+        if df.empty:
+            logger.info('No properties found on page %d, stopping', page_num + 1)
+            break
+
+        all_known = False
+        if known_ids is not None:
+            page_count = len(df)
+            df, all_known = filter_new_or_changed(df, known_ids, known_state)
+            logger.debug('Page %d: %d new or changed of %d', page_num + 1, len(df), page_count)
+        if checkpoint is not None:
+            checkpoint.save(index, df)
+        report(page_num, pages_to_scrape, len(df))
+        yield df
+        if all_known:
+            logger.info('All properties on page %d already known, stopping', page_num + 1)
+            break
+
+    if checkpoint is not None:
+        checkpoint.finish()
+
+
+def iter_listings(base_url: str, **kwargs) -> Iterator[dict]:
+    """
+    Scrape a Rightmove search one listing at a time
 
-        # Scrape remaining pages
-        for page_num in range(1, pages_to_scrape):
-            time.sleep(delay)  # Be polite to the server
+    Listings are yielded page by page as soon as each page is parsed, with each
+    property id yielded only once.
 
-            index = page_num * 24  # Rightmove uses 24 results per page
-            page_url = f"{clean_url}&index={index}"
+    Args:
+        base_url: Base search URL (without index parameter)
+        **kwargs: Any other argument of iter_pages
 
-            print(f"Fetching page {page_num + 1}... ", end='', flush=True)
+    Yields:
+        Dict of the columns of each listing
+    """
+    seen = set()
+    for df in iter_pages(base_url, **kwargs):
+        for listing in df.to_dict('records'):
+            if listing['id'] not in seen:
+                seen.add(listing['id'])
+                yield listing
+
+
+@shared_metrics().timed('scrape_all_pages')
+def scrape_all_pages(base_url: str, max_pages: Optional[int] = None, delay: Optional[float] = 1.0,
+                     transport: Optional[Transport] = None,
+                     known: Optional[Union[Iterable, pd.DataFrame]] = None,
+                     raise_errors: bool = False, checkpoint: Optional[Checkpoint] = None,
+                     progress: Optional[Callable[[PageProgress], None]] = None,
+                     summary: bool = True) -> pd.DataFrame:
+    """
+    Scrape all pages of results from a Rightmove search
+
+    Args:
+        base_url: Base search URL (without index parameter)
+        max_pages: Maximum number of pages to scrape (None = all pages)
+        delay: Minimum interval in seconds between page requests (see iter_pages)
+        transport: HTTP transport shared by all page requests (None = shared default)
+        known: Optional IDs or DataFrame of listings already seen, to only return
+            new or changed listings (see iter_pages)
+        raise_errors: Raise the error if any page can't be scraped, instead of
+            logging it and returning the pages scraped so far (or an empty DataFrame)
+        checkpoint: Optional Checkpoint to save progress to and resume from (see iter_pages)
+        progress: Optional callback called with a PageProgress after each page (see iter_pages)
+        summary: Keep the long summary text of each listing (False = drop it to save memory)
 
-            try:
-                df, _ = scrape_rightmove_page(page_url)
+    Returns:
+        DataFrame containing all properties from all pages
+    """
+    all_properties = list(iter_pages(base_url, max_pages=max_pages, delay=delay, transport=transport,
+                                     known=known, raise_errors=raise_errors, checkpoint=checkpoint,
+                                     progress=progress, summary=summary))
 
-                if df.empty:
-                    print("✗ No properties found, stopping")
-                    break
+    return combine_pages(all_properties)
 
-                all_properties.append(df)
-                print(f"✓ {len(df)} properties")
 
-            except Exception as e:
-                print(f"✗ Error: {e}")
-                print(f"Stopping at page {page_num}")
-                break
+def combine_pages(pages: list) -> pd.DataFrame:
+    """
+    Combine the DataFrames of the pages of a search, without duplicate listings
 
-        # Combine all pages
-        if all_properties:
-            combined_df = pd.concat(all_properties, ignore_index=True)
+    Args:
+        pages: DataFrames of the listings of each page, in page order
 
-            # Remove duplicates (in case any property appears on multiple pages)
-            original_count = len(combined_df)
-            combined_df = combined_df.drop_duplicates(subset=['id'], keep='first')
-            duplicates_removed = original_count - len(combined_df)
+    Returns:
+        DataFrame containing all properties from all pages
+    """
+    if not pages:
+        return pd.DataFrame()
+    # (Categoricals whose categories differ between pages become text when
+    # concatenated, so the listing schema is applied again)
+    combined_df = apply_schema(pd.concat(pages, ignore_index=True))
 
-            print("\n" + "=" * 80)
-            print(f"Total properties scraped: {len(combined_df)}")
-            if duplicates_removed > 0:
-                print(f"Duplicates removed: {duplicates_removed}")
-            print("=" * 80)
+    # Remove duplicates (in case any property appears on multiple pages)
+    original_count = len(combined_df)
+    combined_df = combined_df.drop_duplicates(subset=['id'], keep='first')
+    duplicates_removed = original_count - len(combined_df)
+    shared_metrics().count('duplicates_removed', duplicates_removed)
 
-            return combined_df
-        else:
-            return pd.DataFrame()
+    logger.info('Total properties scraped: %d (%d duplicates removed)', len(combined_df), duplicates_removed)
 
-    except Exception as e:
-        print(f"Error scraping first page: {e}")
-        return pd.DataFrame()
+    return combined_df
 
 
 def create_output_folder() -> Path:
@@ -208,7 +515,17 @@ def create_output_folder() -> Path:
     return run_folder
 
 
-def generate_full_statistics(df: pd.DataFrame, output_folder: Path, search_info: dict = None):
+def _breakdown(stats: PriceStats, column: str, names: dict, decimals: int) -> pd.DataFrame:
+    """Rounded price statistics grouped by `column`, with the `names` (stat ->
+    report column) of the statistics to show"""
+    summary = stats.by(column)[list(names)].round(decimals)
+    summary.columns = list(names.values())
+    return summary
+
+
+@shared_metrics().timed('report')
+def generate_full_statistics(df: pd.DataFrame, output_folder: Path, search_info: dict = None,
+                             stats: Optional[PriceStats] = None):
     """
     Generate a comprehensive statistics text file with ALL data (not limited to top 10/15)
 
@@ -216,6 +533,7 @@ def generate_full_statistics(df: pd.DataFrame, output_folder: Path, search_info:
         df: DataFrame with property data
         output_folder: Folder to save the statistics file
         search_info: Optional dict with search criteria information
+        stats: Optional PriceStats of df, to share with display_summary (computed if not given)
     """
     stats_file = output_folder / "statistics.txt"
 
@@ -238,96 +556,87 @@ def generate_full_statistics(df: pd.DataFrame, output_folder: Path, search_info:
             f.write("No data available.\n")
             return
 
+        stats = stats or PriceStats(df)
+
         # Overall statistics
         f.write("OVERALL STATISTICS\n")
         f.write("-" * 80 + "\n")
         f.write(f"Total properties: {len(df)}\n")
 
-        if 'price' in df.columns and df['price'].notna().any():
-            price_data = df['price'].dropna()
+        if stats.has('price'):
+            overall = stats.overall
             f.write(f"\nPrice statistics:\n")
-            f.write(f"  Count (with price): {len(price_data)}\n")
-            f.write(f"  Average: £{price_data.mean():,.2f} pcm\n")
-            f.write(f"  Median:  £{price_data.median():,.2f} pcm\n")
-            f.write(f"  Std Dev: £{price_data.std():,.2f}\n")
-            f.write(f"  Min:     £{price_data.min():,.2f} pcm\n")
-            f.write(f"  Max:     £{price_data.max():,.2f} pcm\n")
+            f.write(f"  Count (with price): {overall['count']}\n")
+            f.write(f"  Average: £{overall['mean']:,.2f} pcm\n")
+            f.write(f"  Median:  £{overall['median']:,.2f} pcm\n")
+            f.write(f"  Std Dev: £{overall['std']:,.2f}\n")
+            f.write(f"  Min:     £{overall['min']:,.2f} pcm\n")
+            f.write(f"  Max:     £{overall['max']:,.2f} pcm\n")
 
             # Quartiles
             f.write(f"\nPrice quartiles:\n")
-            f.write(f"  25th percentile: £{price_data.quantile(0.25):,.2f} pcm\n")
-            f.write(f"  50th percentile: £{price_data.quantile(0.50):,.2f} pcm\n")
-            f.write(f"  75th percentile: £{price_data.quantile(0.75):,.2f} pcm\n")
+            f.write(f"  25th percentile: £{overall['q25']:,.2f} pcm\n")
+            f.write(f"  50th percentile: £{overall['median']:,.2f} pcm\n")
+            f.write(f"  75th percentile: £{overall['q75']:,.2f} pcm\n")
 
         f.write("\n" + "=" * 80 + "\n\n")
 
+        price_columns = {'count': 'Count', 'mean': 'Avg Price', 'median': 'Median Price',
+                         'min': 'Min Price', 'max': 'Max Price'}
+
         # Full bedroom summary
-        if 'bedrooms' in df.columns and df['bedrooms'].notna().any():
+        if stats.has('bedrooms'):
             f.write("FULL BREAKDOWN BY NUMBER OF BEDROOMS\n")
             f.write("-" * 80 + "\n")
-            bedroom_summary = df.dropna(subset=['price']).groupby('bedrooms').agg({
-                'price': ['count', 'mean', 'median', 'std', 'min', 'max']
-            }).round(2)
-            bedroom_summary.columns = ['Count', 'Avg Price', 'Median Price', 'Std Dev', 'Min Price', 'Max Price']
+            bedroom_summary = _breakdown(stats, 'bedrooms', {'count': 'Count', 'mean': 'Avg Price',
+                                                             'median': 'Median Price', 'std': 'Std Dev',
+                                                             'min': 'Min Price', 'max': 'Max Price'}, 2)
             f.write(bedroom_summary.to_string())
             f.write("\n\n" + "=" * 80 + "\n\n")
 
         # Full postcode summary (ALL postcodes, not just top 15)
-        if 'postcode' in df.columns and df['postcode'].notna().any():
+        if stats.has('postcode'):
             f.write("FULL BREAKDOWN BY POSTCODE (ALL POSTCODES)\n")
             f.write("-" * 80 + "\n")
-            postcode_summary = df.dropna(subset=['postcode', 'price']).groupby('postcode').agg({
-                'price': ['count', 'mean', 'median', 'min', 'max']
-            }).round(2)
-            postcode_summary.columns = ['Count', 'Avg Price', 'Median Price', 'Min Price', 'Max Price']
-            postcode_summary = postcode_summary.sort_values('Count', ascending=False)
+            postcode_summary = _breakdown(stats, 'postcode', price_columns, 2).sort_values('Count', ascending=False)
             f.write(f"Total unique postcodes: {len(postcode_summary)}\n\n")
             f.write(postcode_summary.to_string())
             f.write("\n\n" + "=" * 80 + "\n\n")
 
         # Full property type summary (ALL types)
-        if 'property_type' in df.columns and df['property_type'].notna().any():
+        if stats.has('property_type'):
             f.write("FULL BREAKDOWN BY PROPERTY TYPE (ALL TYPES)\n")
             f.write("-" * 80 + "\n")
-            type_summary = df.dropna(subset=['property_type', 'price']).groupby('property_type').agg({
-                'price': ['count', 'mean', 'median', 'min', 'max']
-            }).round(2)
-            type_summary.columns = ['Count', 'Avg Price', 'Median Price', 'Min Price', 'Max Price']
-            type_summary = type_summary.sort_values('Count', ascending=False)
+            type_summary = _breakdown(stats, 'property_type', price_columns, 2).sort_values('Count', ascending=False)
             f.write(f"Total unique property types: {len(type_summary)}\n\n")
             f.write(type_summary.to_string())
             f.write("\n\n" + "=" * 80 + "\n\n")
 
         # Bathroom summary if available
-        if 'bathrooms' in df.columns and df['bathrooms'].notna().any():
+        if stats.has('bathrooms'):
             f.write("FULL BREAKDOWN BY NUMBER OF BATHROOMS\n")
             f.write("-" * 80 + "\n")
-            bathroom_summary = df.dropna(subset=['bathrooms', 'price']).groupby('bathrooms').agg({
-                'price': ['count', 'mean', 'median', 'min', 'max']
-            }).round(2)
-            bathroom_summary.columns = ['Count', 'Avg Price', 'Median Price', 'Min Price', 'Max Price']
-            bathroom_summary = bathroom_summary.sort_values('Count', ascending=False)
+            bathroom_summary = _breakdown(stats, 'bathrooms', price_columns, 2).sort_values('Count', ascending=False)
             f.write(bathroom_summary.to_string())
             f.write("\n\n" + "=" * 80 + "\n\n")
 
         # Agent/Branch summary
-        if 'branch' in df.columns and df['branch'].notna().any():
+        if stats.has('branch'):
             f.write("FULL BREAKDOWN BY ESTATE AGENT (ALL AGENTS)\n")
             f.write("-" * 80 + "\n")
-            agent_summary = df.dropna(subset=['branch', 'price']).groupby('branch').agg({
-                'price': ['count', 'mean', 'median']
-            }).round(2)
-            agent_summary.columns = ['Count', 'Avg Price', 'Median Price']
+            agent_summary = _breakdown(stats, 'branch', {'count': 'Count', 'mean': 'Avg Price',
+                                                         'median': 'Median Price'}, 2)
             agent_summary = agent_summary.sort_values('Count', ascending=False)
             f.write(f"Total unique agents: {len(agent_summary)}\n\n")
             f.write(agent_summary.to_string())
             f.write("\n\n" + "=" * 80 + "\n\n")
 
         # Added/Reduced status summary
-        if 'added_or_reduced' in df.columns and df['added_or_reduced'].notna().any():
+        if stats.has('added_or_reduced'):
             f.write("BREAKDOWN BY LISTING STATUS\n")
             f.write("-" * 80 + "\n")
-            status_summary = df[df['added_or_reduced'].notna()]['added_or_reduced'].value_counts()
+            status_summary = df['added_or_reduced'].value_counts()
+            status_summary = status_summary[status_summary > 0]  # Unused categories
             for status, count in status_summary.items():
                 f.write(f"{status}: {count}\n")
             f.write("\n" + "=" * 80 + "\n\n")
@@ -338,62 +647,84 @@ def generate_full_statistics(df: pd.DataFrame, output_folder: Path, search_info:
     return stats_file
 
 
-def display_summary(df: pd.DataFrame):
-    """Display summary statistics for the scraped properties"""
+def format_summary(df: pd.DataFrame, stats: Optional[PriceStats] = None) -> str:
+    """Summary statistics for the scraped properties, as text for the console
+
+    Args:
+        df: DataFrame with property data
+        stats: Optional PriceStats of df, to share with generate_full_statistics (computed if not given)
+    """
 
     if df.empty:
-        print("\nNo data to display")
-        return
+        return "\nNo data to display"
 
-    print("\n" + "=" * 80)
-    print("SUMMARY STATISTICS")
-    print("=" * 80)
-    print(f"Total properties: {len(df)}")
-
-    if 'price' in df.columns and df['price'].notna().any():
-        avg_price = df['price'].mean()
-        median_price = df['price'].median()
-        min_price = df['price'].min()
-        max_price = df['price'].max()
-        print(f"\nPrice statistics:")
-        print(f"  Average: £{avg_price:,.0f} pcm")
-        print(f"  Median:  £{median_price:,.0f} pcm")
-        print(f"  Range:   £{min_price:,.0f} - £{max_price:,.0f} pcm")
+    stats = stats or PriceStats(df)
+    lines = []
+
+    lines.append("\n" + "=" * 80)
+    lines.append("SUMMARY STATISTICS")
+    lines.append("=" * 80)
+    lines.append(f"Total properties: {len(df)}")
+
+    if stats.has('price'):
+        overall = stats.overall
+        lines.append(f"\nPrice statistics:")
+        lines.append(f"  Average: £{overall['mean']:,.0f} pcm")
+        lines.append(f"  Median:  £{overall['median']:,.0f} pcm")
+        lines.append(f"  Range:   £{overall['min']:,.0f} - £{overall['max']:,.0f} pcm")
 
     # Summary by bedrooms
-    if 'bedrooms' in df.columns and df['bedrooms'].notna().any():
-        print("\n" + "=" * 80)
-        print("BY NUMBER OF BEDROOMS")
-        print("=" * 80)
-        bedroom_summary = df.dropna(subset=['price']).groupby('bedrooms').agg({
-            'price': ['count', 'mean', 'median', 'min', 'max']
-        }).round(0)
-        bedroom_summary.columns = ['Count', 'Avg Price', 'Median Price', 'Min Price', 'Max Price']
-        print(bedroom_summary.to_string())
+    if stats.has('bedrooms'):
+        lines.append("\n" + "=" * 80)
+        lines.append("BY NUMBER OF BEDROOMS")
+        lines.append("=" * 80)
+        bedroom_summary = _breakdown(stats, 'bedrooms', {'count': 'Count', 'mean': 'Avg Price',
+                                                         'median': 'Median Price', 'min': 'Min Price',
+                                                         'max': 'Max Price'}, 0)
+        lines.append(bedroom_summary.to_string())
 
     # Summary by postcode
-    if 'postcode' in df.columns and df['postcode'].notna().any():
-        print("\n" + "=" * 80)
-        print("TOP 15 POSTCODES")
-        print("=" * 80)
-        postcode_summary = df.dropna(subset=['postcode', 'price']).groupby('postcode').agg({
-            'price': ['count', 'mean']
-        }).round(0)
-        postcode_summary.columns = ['Count', 'Avg Price']
+    if stats.has('postcode'):
+        lines.append("\n" + "=" * 80)
+        lines.append("TOP 15 POSTCODES")
+        lines.append("=" * 80)
+        postcode_summary = _breakdown(stats, 'postcode', {'count': 'Count', 'mean': 'Avg Price'}, 0)
         postcode_summary = postcode_summary.sort_values('Count', ascending=False).head(15)
-        print(postcode_summary.to_string())
+        lines.append(postcode_summary.to_string())
 
     # Summary by property type
-    if 'property_type' in df.columns and df['property_type'].notna().any():
-        print("\n" + "=" * 80)
-        print("TOP 10 PROPERTY TYPES")
-        print("=" * 80)
-        type_summary = df.dropna(subset=['property_type', 'price']).groupby('property_type').agg({
-            'price': ['count', 'mean']
-        }).round(0)
-        type_summary.columns = ['Count', 'Avg Price']
+    if stats.has('property_type'):
+        lines.append("\n" + "=" * 80)
+        lines.append("TOP 10 PROPERTY TYPES")
+        lines.append("=" * 80)
+        type_summary = _breakdown(stats, 'property_type', {'count': 'Count', 'mean': 'Avg Price'}, 0)
         type_summary = type_summary.sort_values('Count', ascending=False).head(10)
-        print(type_summary.to_string())
+        lines.append(type_summary.to_string())
+
+    return "\n".join(lines)
+
+
+def display_summary(df: pd.DataFrame, stats: Optional[PriceStats] = None):
+    """Log summary statistics for the scraped properties (see format_summary)
+
+    The summary is only built when this module's logger is enabled for INFO.
+
+    Args:
+        df: DataFrame with property data
+        stats: Optional PriceStats of df, to share with generate_full_statistics (computed if not given)
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(format_summary(df, stats))
+
+
+def print_progress(progress: PageProgress):
+    """Progress callback printing one line per page to the console"""
+    if progress.page == 1 and progress.result_count is not None:
+        print(f"Total results available: {progress.result_count}")
+    eta = f", ETA {progress.eta:.0f}s" if progress.eta is not None and progress.page < progress.pages else ""
+    source = " (from checkpoint)" if progress.resumed else ""
+    print(f"✓ Page {progress.page}/{progress.pages}: {progress.rows} properties{source} "
+          f"[{progress.total_rows} total, {progress.elapsed:.1f}s{eta}]", flush=True)
 
 
 def main():
@@ -410,15 +741,26 @@ def main():
         "Search URL": url
     }
 
+    # Library output goes through logging; the console shows warnings and errors,
+    # and one line per page from the progress callback
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+
+    print("=" * 80)
+    print("Multi-Page Rightmove Scraper")
+    print("=" * 80)
     print("\nSearch criteria:")
     for key, value in search_info.items():
         if key != "Search URL":
             print(f"- {key}: {value}")
 
-    # Create output folder for this run
+    # Create output folder for this run, or resume an interrupted run of the same search
     print("\n" + "=" * 80)
-    output_folder = create_output_folder()
-    print(f"Output folder created: {output_folder}")
+    output_folder = find_checkpoint(url)
+    if output_folder is not None:
+        print(f"Resuming interrupted run in: {output_folder}")
+    else:
+        output_folder = create_output_folder()
+        print(f"Output folder created: {output_folder}")
     print("=" * 80)
 
     # Scrape all pages (or set max_pages to limit)
@@ -426,27 +768,56 @@ def main():
     # df = scrape_all_pages(url, max_pages=5)  # Scrape first 5 pages only
     # df = scrape_all_pages(url)  # Scrape all pages
 
-    df = scrape_all_pages(url, delay=1.5)  # 1.5 second delay between requests
+    # Pages fetched in the last 10 minutes are reused from the response cache,
+    # and requests are limited to one every 1.5 seconds across the process
+    shared_rate_limiter().configure(rate=1 / 1.5)
+    transport = Transport(cache=ResponseCache(Path("results") / "http_cache.sqlite", ttl=600),
+                          rate_limiter=shared_rate_limiter())
+
+    df = scrape_all_pages(url, transport=transport, checkpoint=Checkpoint(output_folder, url),
+                          progress=print_progress)
 
     if df.empty:
         print("\nNo properties were scraped.")
         return
 
-    # Display summary
-    display_summary(df)
+    print("\n" + "=" * 80)
+    print(f"Total properties scraped: {len(df)}")
+    print("=" * 80)
+
+    # Display summary, computing the price statistics once for the summary and the report
+    stats = PriceStats(df)
+    print(format_summary(df, stats))
 
     # Save CSV to output folder
     csv_file = output_folder / "properties.csv"
     df.to_csv(csv_file, index=False)
 
     # Generate full statistics file
-    stats_file = generate_full_statistics(df, output_folder, search_info)
+    stats_file = generate_full_statistics(df, output_folder, search_info, stats)
+
+    # Record new listings and price changes in the listing store of all runs
+    store = ListingStore(Path("results") / "listings.sqlite")
+    changes = store.upsert(df)
+    store.close()
+
+    # Append to the Parquet history of all runs (needs pyarrow)
+    try:
+        history_file = ParquetStore(Path("results") / "listings.parquet").append(df)
+    except ImportError as e:
+        history_file = f"not saved ({e})"
 
     print(f"\n" + "=" * 80)
     print("FILES SAVED")
     print("=" * 80)
     print(f"CSV file:        {csv_file}")
     print(f"Statistics file: {stats_file}")
+    print(f"History file:    {history_file}")
+    print(f"Listing store:   {store.path} ({changes.new} new, {changes.changed} changed)")
+    if shared_metrics().enabled:
+        metrics_file = output_folder / "metrics.json"
+        metrics_file.write_text(shared_metrics().to_json(indent=2))
+        print(f"Metrics file:    {metrics_file}")
     print(f"Output folder:   {output_folder}")
     print("=" * 80)
 
@@ -462,7 +833,7 @@ def main():
             print(f"   Bedrooms: {int(row['bedrooms'])}")
         if pd.notna(row['price']):
             print(f"   Rent: £{int(row['price']):,} pcm")
-        if row['branch']:
+        if pd.notna(row['branch']):
             print(f"   Agent: {row['branch']}")
 
     print("\n" + "..." + "\n")
@@ -474,7 +845,7 @@ def main():
             print(f"   Bedrooms: {int(row['bedrooms'])}")
         if pd.notna(row['price']):
             print(f"   Rent: £{int(row['price']):,} pcm")
-        if row['branch']:
+        if pd.notna(row['branch']):
             print(f"   Agent: {row['branch']}")
 
     print("\n" + "=" * 80)
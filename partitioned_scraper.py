@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Partitioned Rightmove scraper for searches with more results than can be paged
+Rightmove only serves the first ~1,000 results of a search (42 pages), so large
+searches are split into price (and if needed bedroom) bands which each fit
+"""
+
+import argparse
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+
+from rightmove_webscraper import Transport, default_transport, shared_rate_limiter
+from rightmove_webscraper.listings import apply_schema
+from rightmove_webscraper.nextdata import extract_search_results
+from multi_page_scraper import scrape_all_pages
+
+logger = logging.getLogger(__name__)
+
+# Number of results of a search which can actually be paged through
+ACCESSIBLE_RESULTS = 1000
+
+# Upper bound of the price range when the search has no maxPrice
+PRICE_CEILING = {'rent': 100_000, 'sale': 100_000_000}
+
+MAX_BEDROOMS = 10
+
+
+def set_params(url: str, **params) -> str:
+    """Return `url` with the given query parameters replaced (None = removed) and
+    any page index removed"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k not in params and k != 'index']
+    query += [(k, str(v)) for k, v in params.items() if v is not None]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def get_param(url: str, name: str) -> Optional[int]:
+    """Integer value of a query parameter of `url`, or None if absent/blank"""
+    value = dict(parse_qsl(urlsplit(url).query)).get(name)
+    return int(value) if value and value.isdigit() else None
+
+
+class _FirstPageTransport:
+    """Wraps a transport, keeping the responses of the planner's result count
+    requests so each is reused once as the first page of the sub-query scrape
+    instead of being requested again"""
+    def __init__(self, transport: Transport):
+        self.transport = transport
+        self.responses = {}
+        self.lock = threading.Lock()
+
+    def get(self, url: str):
+        with self.lock:
+            r = self.responses.pop(url, None)
+        return r if r is not None else self.transport.get(url)
+
+    def count(self, url: str) -> int:
+        """Total result count of a search, keeping its first page for later"""
+        r = self.transport.get(url)
+        if r.status_code != 200:
+            raise Exception(f"Failed to fetch page. Status code: {r.status_code}")
+        with self.lock:
+            self.responses[url] = r
+        search_results = extract_search_results(r.content)
+        return int(str(search_results.get('resultCount', 0)).replace(',', '') or 0)
+
+    def discard(self, url: str):
+        """Drop the kept first page of a search which won't be scraped"""
+        with self.lock:
+            self.responses.pop(url, None)
+
+
+def _split_points(low: int, high: int, parts: int) -> List[Tuple[int, int]]:
+    """Split the inclusive price range [low, high] into `parts` contiguous bands,
+    evenly spaced on a log scale for wide ranges and linearly otherwise"""
+    parts = max(2, min(parts, high - low + 1))
+    if high > 4 * max(low, 1):
+        lo = math.log(max(low, 1))
+        edges = [round(math.exp(lo + (math.log(high) - lo) * i / parts)) for i in range(1, parts)]
+    else:
+        edges = [low + (high - low) * i // parts for i in range(1, parts)]
+    bands, start = [], low
+    for edge in sorted(set(e for e in edges if low <= e < high)):
+        bands.append((start, edge))
+        start = edge + 1
+    bands.append((start, high))
+    return bands
+
+
+def _split(url: str, count: int, limit: int) -> List[str]:
+    """Sub-queries covering the search at `url`, sized from its result count"""
+    parts = math.ceil(count / limit)
+    low = get_param(url, 'minPrice') or 0
+    high = get_param(url, 'maxPrice')
+    if high is None:
+        mode = 'rent' if '/property-to-rent/' in url or 'to-let' in url else 'sale'
+        ceiling = PRICE_CEILING[mode]
+        if low < ceiling:
+            # Everything above the ceiling stays one open-ended band:
+            return [set_params(url, minPrice=low, maxPrice=ceiling), set_params(url, minPrice=ceiling + 1)]
+    elif high > low:
+        return [set_params(url, minPrice=lo, maxPrice=hi) for lo, hi in _split_points(low, high, parts)]
+
+    # A price band that can't be split further is split on bedrooms instead:
+    min_beds = get_param(url, 'minBedrooms') or 0
+    max_beds = get_param(url, 'maxBedrooms')
+    max_beds = MAX_BEDROOMS if max_beds is None else max_beds
+    if max_beds > min_beds:
+        return [set_params(url, minBedrooms=b, maxBedrooms=b) for b in range(min_beds, max_beds)] + \
+               [set_params(url, minBedrooms=max_beds, maxBedrooms=get_param(url, 'maxBedrooms'))]
+    return []
+
+
+def plan_partitions(url: str, limit: int = ACCESSIBLE_RESULTS, transport: Optional[Transport] = None,
+                    max_workers: int = 4) -> List[Tuple[str, int]]:
+    """
+    Split a search into sub-queries which each return at most `limit` results
+
+    Each search is counted with one request for its first page. Searches over the
+    limit are split into price bands, as many as their count suggests are needed,
+    and bands which are still over the limit are split again. A band covering a
+    single price is split on bedrooms instead. Sub-queries which can't be split
+    further are kept even though some of their results will be inaccessible.
+    The first pages of searches which are split or have no results are dropped
+    as soon as they are counted, so only those of the sub-queries are kept.
+
+    Args:
+        url: Rightmove search results URL
+        limit: Maximum number of results a sub-query may have
+        transport: HTTP transport for the count requests (None = shared default)
+        max_workers: Maximum number of count requests made concurrently
+
+    Returns:
+        List of (sub-query URL, result count), skipping sub-queries without results
+    """
+    counter = transport if isinstance(transport, _FirstPageTransport) else \
+        _FirstPageTransport(transport or default_transport())
+    plan, level = [], [set_params(url)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while level:
+            next_level = []
+            for query, count in zip(level, executor.map(counter.count, level)):
+                children = _split(query, count, limit) if count > limit else []
+                if children:
+                    next_level.extend(children)
+                elif count:
+                    plan.append((query, count))
+                    continue
+                counter.discard(query)
+            level = next_level
+    return plan
+
+
+def scrape_partitioned(url: str, limit: int = ACCESSIBLE_RESULTS, max_workers: int = 4,
+                       transport: Optional[Transport] = None, delay: Optional[float] = 1.0) -> pd.DataFrame:
+    """
+    Scrape every result of a search, partitioning it if it has more results than
+    can be paged through
+
+    Every sub-query is scraped even if some fail, but then an exception naming the
+    failed sub-queries is raised instead of returning a DataFrame with some of the
+    results missing.
+
+    Args:
+        url: Rightmove search results URL
+        limit: Maximum number of results a sub-query may have
+        max_workers: Maximum number of sub-queries planned and scraped concurrently
+        transport: HTTP transport shared by all requests (None = shared default)
+        delay: Minimum interval in seconds between the page requests of each sub-query
+            (None or 0 = no interval, e.g. when the transport has a rate limiter; see iter_pages)
+
+    Returns:
+        DataFrame of the properties of all sub-queries, de-duplicated by id
+    """
+    transport = _FirstPageTransport(transport or default_transport())
+    plan = plan_partitions(url, limit=limit, transport=transport, max_workers=max_workers)
+    logger.info('Search split into %d sub-queries covering %d results', len(plan), sum(c for _, c in plan))
+
+    def scrape(query: str):
+        try:
+            return scrape_all_pages(query, delay=delay, transport=transport, raise_errors=True), None
+        except Exception as e:
+            logger.error('Error scraping sub-query %s: %s', query, e)
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outcomes = list(executor.map(scrape, [query for query, _ in plan]))
+    failed = [(query, error) for (query, _), (_, error) in zip(plan, outcomes) if error is not None]
+    if failed:
+        details = '\n'.join(f'{query}: {error}' for query, error in failed)
+        raise Exception(f"{len(failed)} of {len(plan)} sub-queries failed:\n{details}") from failed[0][1]
+    frames = [df for df, _ in outcomes if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    df = apply_schema(pd.concat(frames, ignore_index=True))
+    return df.drop_duplicates(subset=['id'], keep='first', ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape all results of a large Rightmove search")
+    parser.add_argument('url', help="Rightmove search results URL")
+    parser.add_argument('--workers', type=int, default=4, help="sub-queries scraped concurrently")
+    parser.add_argument('--rate', type=float, default=1.0, help="maximum requests per second across all workers")
+    parser.add_argument('--output', default='properties.csv', help="CSV file to save the properties to")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    shared_rate_limiter().configure(rate=args.rate)
+    df = scrape_partitioned(args.url, max_workers=args.workers,
+                            transport=Transport(rate_limiter=shared_rate_limiter()), delay=None)
+    df.to_csv(args.output, index=False)
+    print(f"Saved {len(df)} properties to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
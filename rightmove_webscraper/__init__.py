@@ -1,2 +1,8 @@
-
 from .scraper import RightmoveData
+from .transport import Transport, default_transport
+from .async_transport import AsyncTransport
+from .cache import ResponseCache
+from .metrics import Metrics, shared_metrics
+from .ratelimit import AsyncTokenBucket, ProcessTokenBucket, TokenBucket, shared_rate_limiter
+from .storage import ParquetStore
+from .store import ListingStore
@@ -0,0 +1,193 @@
+from collections import namedtuple
+import asyncio
+import importlib
+import os
+from urllib.parse import urlsplit
+
+from .metrics import shared_metrics
+from .ratelimit import AsyncTokenBucket
+from .transport import Transport
+
+AsyncResponse = namedtuple("AsyncResponse", ["url", "status_code", "content", "headers"])
+
+backends = ("httpx", "aiohttp")
+
+
+def _import_backend(name: str):
+    """The module of a backend, imported on first use so that importing the
+    package doesn't import the async HTTP clients."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _default_backend() -> str:
+    for name in backends:
+        if _import_backend(name) is not None:
+            return name
+    raise ImportError("AsyncTransport requires httpx or aiohttp: pip install rightmove_webscraper[async] "
+                      "(or pip install httpx)")
+
+
+class AsyncTransport:
+    """The `AsyncTransport` is the asyncio counterpart of `Transport`, for
+    making many requests concurrently from one event loop.
+
+    Requests go through a pooled `httpx.AsyncClient` (or `aiohttp` session),
+    at most `concurrency` at a time, and are retried like those of `Transport`:
+    on 429 and 5xx responses and failed connections, with exponential backoff
+    and jitter or the server's `Retry-After`. An optional `AsyncTokenBucket`
+    paces every request, and `base_url` redirects rightmove.co.uk requests as
+    for `Transport`. Responses are returned whatever their status code, as
+    `AsyncResponse` tuples with the whole body read.
+
+    The backend is imported when a transport is created, and its client on
+    first use inside the running loop; close it with `aclose` or by using the
+    transport as an async context manager.
+    """
+    retry_statuses = Transport.retry_statuses
+    rightmove_hosts = Transport.rightmove_hosts
+    rewrite = Transport.rewrite
+    _backoff = Transport._backoff
+
+    def __init__(self, concurrency: int = 10, timeout: float = 30.0, retries: int = 3,
+                 backoff_factor: float = 0.5, backoff_max: float = 30.0, headers: dict = None,
+                 rate_limiter: AsyncTokenBucket = None, base_url: str = None, backend: str = None):
+        """Initialize the transport.
+
+        Args:
+            concurrency (int): maximum number of requests in flight, which is
+                also the size of the connection pool.
+            timeout (float): timeout in seconds of each request.
+            retries (int): maximum number of times a request is retried after a
+                retryable status code or a connection error.
+            backoff_factor (float): base delay in seconds of the exponential
+                backoff between retries (see `Transport`).
+            backoff_max (float): upper bound in seconds of a single backoff.
+            headers (dict): optional headers sent with every request.
+            rate_limiter (AsyncTokenBucket): optionally take a token from this
+                rate limiter before every request (including retries).
+            base_url (str): optionally send requests for rightmove.co.uk URLs to
+                this scheme and host instead (default: the `RIGHTMOVE_BASE_URL`
+                environment variable, if set).
+            backend (str): "httpx" or "aiohttp" (default: httpx if installed).
+        """
+        self.backend = backend or _default_backend()
+        if self.backend not in backends:
+            raise ValueError(f"Unknown backend: {self.backend}")
+        self._http = _import_backend(self.backend)
+        if self._http is None:
+            raise ImportError(f"The {self.backend} backend is not installed: pip install {self.backend}")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.headers = headers or {}
+        self.rate_limiter = rate_limiter
+        base_url = base_url if base_url is not None else os.environ.get("RIGHTMOVE_BASE_URL")
+        self.base_url = urlsplit(base_url.rstrip("/")) if base_url else None
+        self._client = None
+        self._semaphore = None
+
+    def _open(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        http = self._http
+        if self.backend == "httpx":
+            limits = http.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+            self._client = http.AsyncClient(limits=limits, timeout=self.timeout, headers=self.headers,
+                                            follow_redirects=True)
+        else:
+            connector = http.TCPConnector(limit=self.concurrency)
+            self._client = http.ClientSession(connector=connector, headers=self.headers,
+                                              timeout=http.ClientTimeout(total=self.timeout))
+
+    async def _request(self, url: str) -> AsyncResponse:
+        if self.backend == "httpx":
+            r = await self._client.get(url)
+            return AsyncResponse(url, r.status_code, r.content, r.headers)
+        async with self._client.get(url) as r:
+            return AsyncResponse(url, r.status, await r.read(), r.headers)
+
+    def _connection_errors(self) -> tuple:
+        if self.backend == "httpx":
+            return self._http.TransportError,
+        return self._http.ClientError, asyncio.TimeoutError
+
+    async def get(self, url: str) -> AsyncResponse:
+        """Make a GET request, retrying retryable failures. The response of the
+        final attempt is returned whatever its status code; the exception of
+        the final attempt is raised if the connection could not be made."""
+        if self._client is None:
+            self._open()
+        url = self.rewrite(url)
+        metrics = shared_metrics()
+        errors = self._connection_errors()
+        for attempt in range(self.retries + 1):
+            final = attempt == self.retries
+            if attempt:
+                metrics.count("retries")
+            if self.rate_limiter is not None:
+                with metrics.timer("rate_limit_wait"):
+                    await self.rate_limiter.acquire()
+            try:
+                async with self._semaphore:
+                    with metrics.timer("request"):
+                        r = await self._request(url)
+            except errors:
+                metrics.count("connection_errors")
+                if final:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            metrics.count("bytes_downloaded", len(r.content))
+            metrics.count(f"responses_{r.status_code}")
+            if self.rate_limiter is not None:
+                if r.status_code == 429:
+                    self.rate_limiter.penalise()
+                elif r.status_code < 400:
+                    self.rate_limiter.reward()
+            if r.status_code not in self.retry_statuses or final:
+                return r
+            await asyncio.sleep(self._backoff(attempt, r.headers.get("Retry-After")))
+
+    async def aclose(self):
+        """Close all pooled connections."""
+        if self._client is not None:
+            if self.backend == "httpx":
+                await self._client.aclose()
+            else:
+                await self._client.close()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+class Prefetched:
+    """Transport serving responses already fetched by an `AsyncTransport`, and
+    a 404 for any other URL, so that synchronous scraping code can run on them
+    without blocking the event loop."""
+    def __init__(self):
+        self.responses = {}
+
+    async def fetch(self, transport: AsyncTransport, urls: list):
+        """Fetch `urls` concurrently, keeping their responses. If any request
+        fails, the others still pending are cancelled before the error is raised."""
+        tasks = [asyncio.ensure_future(transport.get(url)) for url in urls]
+        try:
+            responses = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        self.responses.update(zip(urls, responses))
+
+    def get(self, url: str) -> AsyncResponse:
+        r = self.responses.get(url)
+        return r if r is not None else AsyncResponse(url, 404, b"", {})
@@ -0,0 +1,138 @@
+from collections import namedtuple
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+def normalise_url(url: str) -> str:
+    """Cache key for a URL: lower-case scheme and host, query parameters sorted
+    (so parameter order doesn't matter, but `index` and every other value is
+    kept) and no fragment."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class CachedResponse(namedtuple("CachedResponse", ["url", "status_code", "content", "etag", "last_modified",
+                                                   "expires_at"])):
+    """A response stored in the `ResponseCache`."""
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry is still within its TTL."""
+        return time.time() < self.expires_at
+
+    @property
+    def validators(self) -> dict:
+        """Conditional request headers to revalidate a stale entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """The entry as a `requests.Response`, with `from_cache` set to True."""
+        r = requests.Response()
+        r.url = self.url
+        r.status_code = self.status_code
+        r._content = self.content
+        r.headers = CaseInsensitiveDict({k: v for k, v in [("ETag", self.etag),
+                                                           ("Last-Modified", self.last_modified)] if v})
+        r.encoding = "utf-8"
+        r.from_cache = True
+        return r
+
+
+class ResponseCache:
+    """The `ResponseCache` is a persistent on-disk cache of HTTP responses for
+    the `Transport`, stored as zlib-compressed bodies in a SQLite database.
+
+    Entries are keyed on the normalised URL and expire after a per-entry TTL,
+    after which they are revalidated with the server using their `ETag` and
+    `Last-Modified` headers where available. When the total size of stored
+    bodies exceeds `max_bytes` the least recently used entries are evicted.
+    """
+    def __init__(self, path: str = "rightmove_cache.sqlite", ttl: float = 3600, max_bytes: int = 256 * 2 ** 20,
+                 offline: bool = False):
+        """Open (or create) a cache database.
+
+        Args:
+            path (str): path of the SQLite database file.
+            ttl (float): default number of seconds an entry is served without
+                revalidation.
+            max_bytes (int): maximum total size of the compressed bodies.
+            offline (bool): serve every stored entry regardless of its TTL and
+                never make requests, to replay a previous run without network.
+        """
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY, url TEXT, status_code INTEGER, body BLOB, size INTEGER, etag TEXT,
+            last_modified TEXT, expires_at REAL, accessed_at REAL)""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def get(self, url: str) -> CachedResponse:
+        """The stored entry for `url` (fresh or stale), or None."""
+        key = normalise_url(url)
+        with self._lock:
+            row = self._conn.execute("""SELECT url, status_code, body, etag, last_modified, expires_at
+                FROM responses WHERE key = ?""", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        url, status_code, body, etag, last_modified, expires_at = row
+        return CachedResponse(url, status_code, zlib.decompress(body), etag, last_modified, expires_at)
+
+    def set(self, url: str, response: requests.Response, ttl: float = None):
+        """Store a response, evicting least recently used entries if the cache
+        grows beyond `max_bytes`."""
+        body = zlib.compress(response.content)
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                normalise_url(url), url, response.status_code, body, len(body), response.headers.get("ETag"),
+                response.headers.get("Last-Modified"), now + ttl, now))
+            self._evict()
+
+    def refresh(self, url: str, ttl: float = None):
+        """Renew the TTL of an entry the server confirmed is unchanged."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires_at = ? WHERE key = ?",
+                               (time.time() + ttl, normalise_url(url)))
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evict = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            evict.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+
+    def clear(self):
+        """Delete every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
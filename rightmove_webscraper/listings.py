@@ -0,0 +1,104 @@
+from datetime import datetime
+import re
+
+import pandas as pd
+
+# Output column -> path to the field in a `searchResults` property:
+field_map = {
+    "id": ("id",),
+    "price": ("price", "amount"),
+    "price_display": ("price", "displayPrices", 0, "displayPrice"),
+    "frequency": ("price", "frequency"),
+    "property_type": ("propertySubType",),
+    "bedrooms": ("bedrooms",),
+    "bathrooms": ("bathrooms",),
+    "address": ("displayAddress",),
+    "summary": ("summary",),
+    "property_url": ("propertyUrl",),
+    "contact_url": ("contactUrl",),
+    "branch": ("customer", "branchDisplayName"),
+    "branch_id": ("customer", "branchId"),
+    "added_or_reduced": ("addedOrReduced",),
+    "first_visible_date": ("firstVisibleDate",),
+    "let_type": ("letType",),
+}
+columns = list(field_map) + ["postcode", "search_date"]
+
+# Compact dtypes of the listing columns (the others are free text): nullable
+# integers sized to their values, categoricals for the repeated strings, and a
+# timestamp for the search date:
+dtypes = {
+    "id": "Int64",
+    "price": "Int32",
+    "price_display": "category",
+    "frequency": "category",
+    "property_type": "category",
+    "bedrooms": "Int16",
+    "bathrooms": "Int16",
+    "branch": "category",
+    "branch_id": "Int32",
+    "added_or_reduced": "category",
+    "let_type": "category",
+    "postcode": "category",
+}
+
+base_url = "https://www.rightmove.co.uk"
+postcode_pattern = re.compile(r"\b([A-Z]{1,2}[0-9][A-Z0-9]?)\b")
+
+
+def _column(properties: list, path: tuple) -> list:
+    """Values at `path` in every property, or None where the path is missing."""
+    if len(path) == 1:
+        key = path[0]
+        return [prop.get(key) for prop in properties]
+    values = []
+    for prop in properties:
+        value = prop
+        for key in path:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                value = None
+                break
+        values.append(value)
+    return values
+
+
+def apply_schema(df: pd.DataFrame, summary: bool = True) -> pd.DataFrame:
+    """Return `df` with its listing columns converted to the compact `dtypes`
+    and `search_date` to a timestamp, e.g. to restore the categoricals after
+    concatenating pages whose categories differ. Columns already of the right
+    type are left as they are, and `df` itself is never modified.
+
+    Args:
+        df (pd.DataFrame): listings, with any subset of `columns`.
+        summary (bool): keep the `summary` column, which is long free text and
+            usually most of the memory used (else it is dropped).
+    """
+    if not summary and "summary" in df.columns:
+        df = df.drop(columns="summary")
+    converted = {c: dtype for c, dtype in dtypes.items() if c in df.columns and df[c].dtype != dtype}
+    if converted:
+        df = df.astype(converted)
+    if "search_date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["search_date"]):
+        df = df.assign(search_date=pd.to_datetime(df["search_date"], format="ISO8601"))
+    return df
+
+
+def normalise_listings(properties: list, search_date: str = None, summary: bool = True) -> pd.DataFrame:
+    """Build a DataFrame with one row per property from the `properties` list of
+    a page's `searchResults`, one column at a time according to `field_map`,
+    with the compact dtypes of `apply_schema`.
+
+    Args:
+        properties (list): property dicts from `searchResults["properties"]`.
+        search_date (str): timestamp stamped on every row (else the current
+            time, taken once for the whole page).
+        summary (bool): keep the `summary` column (see `apply_schema`).
+    """
+    fields = {c: path for c, path in field_map.items() if summary or c != "summary"}
+    df = pd.DataFrame({c: _column(properties, path) for c, path in fields.items()}, columns=list(fields))
+    df["property_url"] = base_url + df["property_url"].fillna("").astype(str)
+    df["postcode"] = df["address"].astype(str).str.extract(postcode_pattern, expand=False)
+    df["search_date"] = pd.Timestamp(search_date if search_date is not None else datetime.now())
+    return apply_schema(df)
@@ -0,0 +1,142 @@
+from contextlib import nullcontext
+from functools import wraps
+import json
+import math
+import os
+import threading
+import time
+
+_disabled_timer = nullcontext()
+
+
+class _Timer:
+    """Context manager adding the seconds spent in its block to a timer."""
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+def _percentile(ordered: list, q: float) -> float:
+    """Nearest-rank percentile of sorted `ordered`."""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class Metrics:
+    """The `Metrics` are named counters and timers recorded by the stages of a
+    scrape (requests, parsing, cleaning, reports), to see where a run spends
+    its time.
+
+    Timers keep every duration observed so that percentiles can be reported,
+    counters keep a running total. Both can be exported as a dict, as JSON or
+    in the Prometheus text format. While disabled nothing is recorded, and
+    `timer` and `count` return straight away.
+    """
+    quantiles = (0.5, 0.9, 0.99)
+
+    def __init__(self, enabled: bool = True):
+        """Initialize empty metrics.
+
+        Args:
+            enabled (bool): record metrics (they can also be switched on and
+                off later with `enable` and `disable`).
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timers = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def count(self, name: str, value: float = 1):
+        """Add `value` to the counter `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        """Record a duration of `seconds` in the timer `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._timers.setdefault(name, []).append(seconds)
+
+    def timer(self, name: str):
+        """Context manager recording the time spent in its block in the timer
+        `name`."""
+        if not self.enabled:
+            return _disabled_timer
+        return _Timer(self, name)
+
+    def timed(self, name: str):
+        """Decorator recording the time spent in every call of a function in
+        the timer `name`."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Timer(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def to_dict(self) -> dict:
+        """Counters, and the count, total, mean, max and percentiles (in
+        seconds) of every timer."""
+        with self._lock:
+            counters = dict(self._counters)
+            timers = {name: sorted(values) for name, values in self._timers.items()}
+        summaries = {}
+        for name, ordered in timers.items():
+            total = sum(ordered)
+            summary = {"count": len(ordered), "total": total, "mean": total / len(ordered), "max": ordered[-1]}
+            summary.update({f"p{round(q * 100)}": _percentile(ordered, q) for q in self.quantiles})
+            summaries[name] = summary
+        return {"counters": counters, "timers": summaries}
+
+    def to_json(self, **kwargs) -> str:
+        """`to_dict` as JSON, passing `kwargs` to `json.dumps`."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "rightmove_") -> str:
+        """Counters and timers in the Prometheus text exposition format, the
+        timers as summaries in seconds."""
+        data = self.to_dict()
+        lines = []
+        for name, value in sorted(data["counters"].items()):
+            lines += [f"# TYPE {prefix}{name}_total counter", f"{prefix}{name}_total {value}"]
+        for name, summary in sorted(data["timers"].items()):
+            metric = f"{prefix}{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            lines += [f'{metric}{{quantile="{q}"}} {summary[f"p{round(q * 100)}"]}' for q in self.quantiles]
+            lines += [f"{metric}_sum {summary['total']}", f"{metric}_count {summary['count']}"]
+        return "\n".join(lines) + "\n"
+
+
+_shared_metrics = Metrics(enabled=os.environ.get("RIGHTMOVE_METRICS", "") not in ("", "0"))
+
+
+def shared_metrics() -> Metrics:
+    """Process-wide `Metrics` recorded by the scrapers, disabled unless the
+    `RIGHTMOVE_METRICS` environment variable is set (or `enable` is called)."""
+    return _shared_metrics
@@ -0,0 +1,288 @@
+"""
+A local stand-in for rightmove.co.uk, serving generated search results and
+property pages, for deterministic end-to-end and load testing without a network.
+
+Usage:
+    python -m rightmove_webscraper.mock_server --results 2000 --latency 0.05 --throttle-rate 0.1
+
+then point the scrapers at it with `Transport(base_url=...)` or the
+`RIGHTMOVE_BASE_URL` environment variable.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PAGE_SIZE = 24
+MAX_PAGES = 42
+
+_search_path = re.compile(r"^/(property-to-rent|property-for-sale|new-homes-for-sale)/find\.html$")
+_property_path = re.compile(r"^/properties/(\d+)")
+_property_types = ["Flat", "Apartment", "Terraced", "Semi-Detached", "Detached", "Studio"]
+_streets = ["High Street", "Station Road", "Church Lane", "Camberwell Road", "Victoria Road", "Park Avenue"]
+_postcodes = ["SE1", "SE5", "SE15", "SW9", "E1", "E14", "N1", "NW3", "W2", "EC1A"]
+
+
+def _listing(property_id: int, rng: random.Random, rent: bool) -> dict:
+    """A generated property as it appears in `searchResults.properties`."""
+    property_type = rng.choice(_property_types)
+    bedrooms = 0 if property_type == "Studio" else rng.randint(1, 5)
+    price = (rng.randint(8, 40) * 50 + bedrooms * 250) if rent else (rng.randint(15, 150) * 5000 + bedrooms * 50_000)
+    postcode = rng.choice(_postcodes)
+    display_price = f"£{price:,} pcm" if rent else f"£{price:,}"
+    branch_id = rng.randint(1, 50)
+    return {
+        "id": property_id,
+        "bedrooms": bedrooms,
+        "bathrooms": max(1, bedrooms - 1),
+        "summary": f"A {bedrooms} bedroom {property_type.lower()} close to local amenities.",
+        "displayAddress": f"{rng.randint(1, 200)} {rng.choice(_streets)}, London {postcode} {rng.randint(1, 9)}AB",
+        "propertySubType": property_type,
+        "price": {"amount": price, "frequency": "monthly" if rent else "not specified",
+                  "displayPrices": [{"displayPrice": display_price}]},
+        "customer": {"branchId": branch_id, "branchDisplayName": f"Agent {branch_id}, London"},
+        "propertyUrl": f"/properties/{property_id}#/?channel={'RES_LET' if rent else 'RES_BUY'}",
+        "contactUrl": f"/property-to-rent/contactBranch.html?propertyId={property_id}",
+        "addedOrReduced": rng.choice(["Added today", "Added yesterday", "Reduced today", "Added on 01/10/2025"]),
+        "firstVisibleDate": "2025-10-01T10:00:00Z",
+        "letType": "Long term" if rent else None,
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    # A deep accept queue so that bursts of concurrent clients aren't refused:
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    mock = None  # Set on the subclass made for each `MockRightmoveServer`
+
+    def do_GET(self):
+        status, body, headers = self.mock.respond(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockRightmoveServer:
+    """The `MockRightmoveServer` serves search results and property pages in
+    the formats of www.rightmove.co.uk from a local HTTP server.
+
+    Every search draws from the same generated set of listings, filtered by
+    the `minPrice`, `maxPrice`, `minBedrooms` and `maxBedrooms` parameters and
+    paginated with `index` as on the real site: at most 42 pages of 24 results
+    are accessible and later pages are answered with status 400. Results pages
+    use the Next.js `__NEXT_DATA__` layout, or the legacy html layout read by
+    `RightmoveData` (per request with `format=legacy` in the query). Property
+    pages at /properties/<id> have a floorplan when the id is even.
+
+    Responses can be slowed down and made to fail at random, seeded so that
+    runs are repeatable; the status of every response is counted in `served`.
+    """
+    def __init__(self, results: int = 1000, layout: str = "next", latency=0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 0, seed: int = 0,
+                 host: str = "127.0.0.1", port: int = 0):
+        """Generate the listings and bind the server (call `start` to serve).
+
+        Args:
+            results (int): number of listings of each search type.
+            layout (str): default layout of results pages, "next" or "legacy".
+            latency (float or tuple): seconds added to every response, or a
+                (min, max) range to draw each delay from uniformly.
+            error_rate (float): fraction of requests answered with status 500.
+            throttle_rate (float): fraction of requests answered with status
+                429 and a `Retry-After` header of `retry_after` seconds.
+            retry_after (int): `Retry-After` of throttled responses.
+            seed (int): seed of the generated listings and random failures.
+            host (str): address to listen on.
+            port (int): port to listen on (default: any free port).
+        """
+        if layout not in ("next", "legacy"):
+            raise ValueError(f"Unknown layout: {layout}")
+        self.layout = layout
+        self.latency = latency if isinstance(latency, (tuple, list)) else (latency, latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.served = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        rng = random.Random(seed)
+        self.listings = {
+            "rent": [_listing(10_000_000 + i, rng, True) for i in range(results)],
+            "sale": [_listing(20_000_000 + i, rng, False) for i in range(results)],
+        }
+        handler = type("Handler", (_Handler,), {"mock": self})
+        self._server = _Server((host, port), handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, to pass as a `Transport`'s `base_url`."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests from a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def search(self, channel: str, query: dict) -> list:
+        """The listings of `channel` ("rent" or "sale") matching the filters in
+        `query`, a dict of query parameters."""
+        def bound(name, default):
+            try:
+                return int(query[name])
+            except (KeyError, ValueError):
+                return default
+        min_price, max_price = bound("minPrice", 0), bound("maxPrice", float("inf"))
+        min_bedrooms, max_bedrooms = bound("minBedrooms", 0), bound("maxBedrooms", float("inf"))
+        return [p for p in self.listings[channel]
+                if min_price <= p["price"]["amount"] <= max_price and min_bedrooms <= p["bedrooms"] <= max_bedrooms]
+
+    def respond(self, path: str):
+        """Status, body and extra headers of the response to a request for `path`."""
+        low, high = self.latency
+        if high > 0:
+            time.sleep(random.uniform(low, high))
+        with self._lock:
+            draw = self._rng.random()
+        if draw < self.throttle_rate:
+            status, body, headers = 429, b"Too Many Requests", {"Retry-After": str(self.retry_after)}
+        elif draw < self.throttle_rate + self.error_rate:
+            status, body, headers = 500, b"Internal Server Error", {}
+        else:
+            status, body = self._page(path)
+            headers = {}
+        with self._lock:
+            self.served[status] += 1
+        return status, body, headers
+
+    def _page(self, path: str):
+        parts = urlsplit(path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        match = _search_path.match(parts.path)
+        if match:
+            channel = "rent" if match.group(1) == "property-to-rent" else "sale"
+            matches = self.search(channel, query)
+            try:
+                index = int(query.get("index", 0))
+            except ValueError:
+                return 400, b"Bad Request"
+            if index < 0 or index >= PAGE_SIZE * MAX_PAGES:
+                return 400, b"Bad Request"
+            page = matches[index:index + PAGE_SIZE]
+            if query.get("format", self.layout) == "legacy":
+                return 200, self._legacy_page(page, len(matches), channel)
+            return 200, self._next_page(page, len(matches), index, channel)
+        match = _property_path.match(parts.path)
+        if match:
+            return 200, self._property_page(int(match.group(1)))
+        return 404, b"Not Found"
+
+    @staticmethod
+    def _next_page(page: list, count: int, index: int, channel: str) -> bytes:
+        pages = min(-(-count // PAGE_SIZE), MAX_PAGES)
+        data = {"props": {"pageProps": {"searchResults": {
+                    "properties": page,
+                    "resultCount": f"{count:,}",
+                    "pagination": {"total": pages, "page": str(index // PAGE_SIZE + 1)},
+                }}},
+                "page": f"/property-{'to-rent' if channel == 'rent' else 'for-sale'}/find", "buildId": "mock"}
+        return (f"""<html><head><title>Property search</title></head><body><div id="__next"></div>
+<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>
+</body></html>""").encode("utf-8")
+
+    @staticmethod
+    def _legacy_page(page: list, count: int, channel: str) -> bytes:
+        price_tag = "span" if channel == "rent" else "div"
+        cards = []
+        for p in page:
+            title = "Studio flat" if p["bedrooms"] == 0 else f"{p['bedrooms']} bedroom {p['propertySubType'].lower()}"
+            cards.append(f"""<div class="propertyCard">
+<div class="propertyCard-details"><a class="propertyCard-link" href="/properties/{p['id']}">
+<h2 class="propertyCard-title">
+    {escape(title)}
+</h2></a>
+<address class="propertyCard-address"><span>{escape(p['displayAddress'])}</span></address></div>
+<{price_tag} class="propertyCard-priceValue">{escape(p['price']['displayPrices'][0]['displayPrice'])}</{price_tag}>
+<div class="propertyCard-contactsItem"><div class="propertyCard-branchLogo">
+<a class="propertyCard-branchLogo-link" href="/estate-agents/agent-{p['customer']['branchId']}.html"></a></div></div>
+</div>""")
+        return (f"""<html><body><span class="searchHeader-resultCount">{count:,}</span>
+{''.join(cards)}
+</body></html>""").encode("utf-8")
+
+    @staticmethod
+    def _property_page(property_id: int) -> bytes:
+        floorplan = ""
+        if property_id % 2 == 0:
+            floorplan = f"""<div id="floorplanTabs"><div></div><div><div></div>
+<div><img src="https://media.rightmove.co.uk/floorplans/{property_id}_FLP_00.png"></div></div></div>"""
+        return (f"""<html><body><h1>Property {property_id}</h1>
+{floorplan}
+</body></html>""").encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve generated Rightmove pages locally for testing")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--results", type=int, default=1000, help="listings of each search type")
+    parser.add_argument("--layout", choices=["next", "legacy"], default="next")
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.0],
+                        help="seconds added to each response, or a min and max")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    latency = tuple(args.latency[:2]) if len(args.latency) > 1 else args.latency[0]
+    server = MockRightmoveServer(results=args.results, layout=args.layout, latency=latency,
+                                 error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                                 retry_after=args.retry_after, seed=args.seed, host=args.host, port=args.port)
+    print(f"Serving on {server.url} (set RIGHTMOVE_BASE_URL={server.url})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(dict(server.served))
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
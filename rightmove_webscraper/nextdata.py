@@ -0,0 +1,52 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_script_tag = b'<script id="__NEXT_DATA__"'
+_script_end = b"</script>"
+_search_results_key = b'"searchResults":'
+_decoder = json.JSONDecoder()
+
+
+def find_next_data(content: bytes) -> bytes:
+    """Return the raw JSON bytes of the `__NEXT_DATA__` script in the page,
+    located by byte offset without decoding the rest of the page."""
+    start = content.find(_script_tag)
+    if start == -1:
+        raise ValueError("Could not find property data in page")
+    start = content.find(b">", start) + 1
+    end = content.find(_script_end, start)
+    if not start or end == -1:
+        raise ValueError("Could not find property data in page")
+    return content[start:end]
+
+
+def extract_search_results(content: bytes) -> dict:
+    """Return the `props.pageProps.searchResults` object of a results page.
+
+    If `orjson` is installed the whole payload is parsed with it: orjson has no
+    `raw_decode`, so parsing just the subtree would mean parsing it to find its
+    end and then again, which is slower than parsing everything once (see
+    `test_extract_search_results` in benchmarks). Otherwise only the
+    `searchResults` subtree is decoded and parsed with the standard library,
+    falling back to parsing the whole payload if the subtree can't be found.
+
+    Args:
+        content (bytes): raw body of a rightmove results page.
+    """
+    payload = find_next_data(content)
+    if orjson is not None:
+        return orjson.loads(payload)["props"]["pageProps"]["searchResults"]
+    key = payload.find(_search_results_key)
+    if key != -1:
+        subtree = payload[key + len(_search_results_key):].decode("utf-8")
+        try:
+            search_results, _ = _decoder.raw_decode(subtree, len(subtree) - len(subtree.lstrip()))
+        except json.JSONDecodeError:
+            search_results = None
+        if isinstance(search_results, dict) and "properties" in search_results:
+            return search_results
+    return json.loads(payload)["props"]["pageProps"]["searchResults"]
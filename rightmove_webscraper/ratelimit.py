@@ -0,0 +1,138 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+
+
+class TokenBucket:
+    """The `TokenBucket` rate limiter caps the rate of requests made through it,
+    and can be shared between threads (e.g. by every `Transport` in a process).
+
+    Tokens accrue at `rate` per second up to `burst`, and each request takes one
+    token, waiting for it if none are available. Time spent on a request counts
+    towards the next token, so unlike a fixed sleep between requests no time is
+    wasted when responses are slow. The rate adapts to the server: it is halved
+    (down to `min_rate`) when the server answers 429 Too Many Requests, and
+    recovers gradually back to its ceiling with every successful request.
+    """
+    def __init__(self, rate: float = 1.0, burst: int = 1, min_rate: float = None, recovery: float = 0.05):
+        """Initialize the bucket full of tokens.
+
+        Args:
+            rate (float): maximum sustained requests per second.
+            burst (int): maximum number of requests made back to back after an
+                idle period.
+            min_rate (float): lowest rate the bucket slows down to after 429
+                responses (default: 5% of `rate`).
+            recovery (float): fraction of `rate` restored by every successful
+                request after slowing down.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate * 0.05
+        self.recovery = recovery
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def configure(self, rate: float = None, burst: int = None):
+        """Change the rate ceiling and/or burst size, e.g. of the shared bucket."""
+        with self._lock:
+            if rate is not None:
+                self.max_rate = self.rate = rate
+                self.min_rate = rate * 0.05
+            if burst is not None:
+                self.burst = burst
+                self._tokens = min(self._tokens, burst)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, blocking until one is available."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalise(self):
+        """Slow down after the server signalled too many requests."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+    def reward(self):
+        """Speed back up towards the ceiling after a successful request."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + self.recovery * self.max_rate)
+
+
+class AsyncTokenBucket(TokenBucket):
+    """A `TokenBucket` for asyncio code: `acquire` is a coroutine which waits
+    for a token without blocking the event loop, so one bucket can pace every
+    request made by the tasks of a loop."""
+    async def acquire(self):
+        """Take a token, waiting until one is available."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+class ProcessTokenBucket(TokenBucket):
+    """A `TokenBucket` whose state lives in shared memory, so that one rate limit
+    can be shared by several worker processes. Pass it to the workers when they
+    are started, e.g. through the `initargs` of a process pool."""
+    def __init__(self, rate: float = 1.0, burst: int = 1, min_rate: float = None, recovery: float = 0.05):
+        self._state = multiprocessing.Array("d", 3, lock=False)
+        super().__init__(rate=rate, burst=burst, min_rate=min_rate, recovery=recovery)
+        self._lock = multiprocessing.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._state[0]
+
+    @rate.setter
+    def rate(self, value: float):
+        self._state[0] = value
+
+    @property
+    def _tokens(self) -> float:
+        return self._state[1]
+
+    @_tokens.setter
+    def _tokens(self, value: float):
+        self._state[1] = value
+
+    @property
+    def _updated(self) -> float:
+        return self._state[2]
+
+    @_updated.setter
+    def _updated(self, value: float):
+        self._state[2] = value
+
+
+_shared_rate_limiter = TokenBucket(rate=1.0, burst=1)
+
+
+def shared_rate_limiter() -> TokenBucket:
+    """Process-wide `TokenBucket` (1 request per second unless changed with
+    `configure`), so that all searches running in the process share one
+    politeness ceiling. It is opt-in: only transports it is passed to are
+    limited by it, not the default transport."""
+    return _shared_rate_limiter
@@ -1,9 +1,13 @@
 
+from concurrent.futures import ThreadPoolExecutor
 import datetime
-from lxml import html
+import re
+from lxml import etree, html
 import numpy as np
 import pandas as pd
-import requests
+
+from .metrics import shared_metrics
+from .transport import Transport, default_transport
 
 
 class RightmoveData:
@@ -16,7 +20,35 @@ class RightmoveData:
 
     The query to rightmove can be renewed by calling the `refresh_data` method.
     """
-    def __init__(self, url: str, get_floorplans: bool = False):
+    # Xpaths to the target elements, compiled once for all instances:
+    _xp_rent_prices = etree.XPath("""//span[@class="propertyCard-priceValue"]/text()""")
+    _xp_sale_prices = etree.XPath("""//div[@class="propertyCard-priceValue"]/text()""")
+    _xp_titles = etree.XPath("""//div[@class="propertyCard-details"]\
+        //a[@class="propertyCard-link"]\
+        //h2[@class="propertyCard-title"]/text()""")
+    _xp_addresses = etree.XPath("""//address[@class="propertyCard-address"]//span/text()""")
+    _xp_weblinks = etree.XPath("""//div[@class="propertyCard-details"]//a[@class="propertyCard-link"]/@href""")
+    _xp_agent_urls = etree.XPath("""//div[@class="propertyCard-contactsItem"]\
+        //div[@class="propertyCard-branchLogo"]\
+        //a[@class="propertyCard-branchLogo-link"]/@href""")
+    _xp_result_count = etree.XPath("""//span[@class="searchHeader-resultCount"]/text()""")
+    _xp_floorplan_url = etree.XPath("""//*[@id="floorplanTabs"]/div[2]/div[2]/img/@src""")
+
+    # Patterns used to clean the results, also compiled once. A postcode is an
+    # outward code (area, e.g. "SE18" or "EC1A") optionally followed by an
+    # inward code ("6AB"); the greedy prefix makes the last one in the address
+    # match, as addresses end with the postcode. Any mention of a studio takes
+    # precedence over a number of bedrooms:
+    _re_non_digits = re.compile(r"\D+")
+    _re_postcode = re.compile(r"^.*\b(?P<outward>[A-Z]{1,2}[0-9][A-Z0-9]?)(?:\s+(?P<inward>[0-9][A-Z]{2}))?\b",
+                              re.IGNORECASE | re.DOTALL)
+    _re_bedrooms = re.compile(r"(?P<studio>^(?=.*studio))|\b(?P<bedrooms>[0-9]{1,2})\b", re.IGNORECASE | re.DOTALL)
+
+    # Memoised values derived from `get_results` (the rest come from the first page):
+    _results_memo_keys = frozenset({"results_count", "average_price", "summary"})
+
+    def __init__(self, url: str, get_floorplans: bool = False, max_workers: int = 1,
+                 transport: Transport = None, floorplan_workers: int = 1):
         """Initialize the scraper with a URL from the results of a property
         search performed on www.rightmove.co.uk.
 
@@ -25,18 +57,74 @@ class RightmoveData:
             get_floorplans (bool): optionally scrape links to the individual
                 floor plan images for each listing (be warned this drastically
                 increases runtime so is False by default).
+            max_workers (int): maximum number of results pages requested
+                concurrently once the page count is known. Defaults to 1,
+                which fetches the pages one at a time. The transport's rate
+                limiter, if any, still caps the request rate: with
+                `shared_rate_limiter()` at its rate (default 1 per second)
+                whatever the number of workers.
+            transport (Transport): optionally pass the HTTP transport used for
+                all requests (else the shared default transport is used).
+            floorplan_workers (int): maximum number of listing pages requested
+                concurrently when scraping floor plans. Defaults to 1. Also
+                capped by the transport's rate limiter, if any.
         """
-        self._status_code, self._first_page = self._request(url)
-        self._url = url
-        self._validate_url()
-        self._results = self._get_results(get_floorplans=get_floorplans)
+        self._setup(transport, max_workers, floorplan_workers)
+        self._load(url, get_floorplans)
+
+    def _setup(self, transport, max_workers: int = 1, floorplan_workers: int = 1):
+        """Set the attributes every instance has before its first search, both
+        when constructed and when created by `create_async`."""
+        self._transport = transport if transport is not None else default_transport()
+        self._max_workers = max_workers
+        self._floorplan_workers = floorplan_workers
+        self._memo = {}
+        self._first_tree = None
+
+    @classmethod
+    async def create_async(cls, url: str, get_floorplans: bool = False, transport=None):
+        """Asynchronous equivalent of constructing a `RightmoveData`, which
+        requests the results pages (and the listing pages, for floor plans)
+        concurrently through an `AsyncTransport` instead of one at a time.
+        Parsing and cleaning are the same as for the constructor. Methods
+        called on the instance afterwards, e.g. `refresh_data`, request pages
+        through the shared default transport as usual.
 
-    @staticmethod
-    def _request(url: str):
-        r = requests.get(url)
+        Args:
+            url (str): full HTML link to a page of rightmove search results.
+            get_floorplans (bool): optionally scrape links to the individual
+                floor plan images for each listing.
+            transport (AsyncTransport): optionally pass the asynchronous
+                transport used for all requests (else a new one without a rate
+                limit is created, and closed after).
+        """
+        from .async_transport import AsyncTransport, Prefetched
+        if transport is None:
+            async with AsyncTransport() as transport:
+                return await cls.create_async(url, get_floorplans, transport)
+        prefetched = Prefetched()
+        await prefetched.fetch(transport, [url])
+
+        # The first page (parsed once, and reused when scraping) gives the page
+        # count; the other pages are then fetched together and scraped:
+        self = cls.__new__(cls)
+        self._setup(prefetched)
+        self._set_first_page(url, *self._request(url))
+        await prefetched.fetch(transport, self._page_urls())
+        self._set_results(self._get_results())
+        if get_floorplans:
+            await prefetched.fetch(transport, self._results["url"].dropna().tolist())
+            self.enrich_floorplans()
+        self._transport = default_transport()
+        return self
+
+    @shared_metrics().timed("fetch")
+    def _request(self, url: str):
+        r = self._transport.get(url)
         return r.status_code, r.content
 
-    def refresh_data(self, url: str = None, get_floorplans: bool = False):
+    def refresh_data(self, url: str = None, get_floorplans: bool = False, max_workers: int = None,
+                     floorplan_workers: int = None):
         """Make a fresh GET request for the rightmove data.
 
         Args:
@@ -45,12 +133,54 @@ class RightmoveData:
             get_floorplans (bool): optionally scrape links to the individual
                 flooplan images for each listing (this drastically increases
                 runtime so is False by default).
+            max_workers (int): optionally change the maximum number of results
+                pages requested concurrently (else keeps the current setting).
+            floorplan_workers (int): optionally change the maximum number of
+                listing pages requested concurrently for floor plans.
         """
         url = self.url if not url else url
-        self._status_code, self._first_page = self._request(url)
+        self._max_workers = self._max_workers if not max_workers else max_workers
+        self._floorplan_workers = self._floorplan_workers if not floorplan_workers else floorplan_workers
+        self._load(url, get_floorplans)
+
+    def _load(self, url: str, get_floorplans: bool):
+        """Request the first page of results and scrape the search."""
+        self._set_first_page(url, *self._request(url))
+        self._set_results(self._get_results(get_floorplans=get_floorplans))
+
+    def _set_first_page(self, url: str, status_code: int, content: bytes):
+        """Start a new search from its first page of results, discarding
+        everything memoised from any previous search."""
+        self._status_code, self._first_page = status_code, content
+        self._first_tree = None
+        self._memo = {}
         self._url = url
         self._validate_url()
-        self._results = self._get_results(get_floorplans=get_floorplans)
+        self._set_rent_or_sale()
+
+    def _set_results(self, results: pd.DataFrame):
+        """Store the results of the search, discarding the values memoised from
+        the previous results (their count, average price and summaries)."""
+        self._results = results
+        self._memo = {k: v for k, v in self._memo.items()
+                      if (k[0] if isinstance(k, tuple) else k) not in self._results_memo_keys}
+
+    def _memoised(self, key, compute):
+        """Value of `compute()`, computed once per search and stored under `key`
+        until the data is refreshed (or, for the `_results_memo_keys`, until the
+        results are replaced by `_set_results`)."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def _parse(self, content: bytes):
+        """Parse a page of html, reusing the tree of the first results page
+        which is parsed only once."""
+        if content is not self._first_page:
+            return html.fromstring(content)
+        if self._first_tree is None:
+            self._first_tree = html.fromstring(content)
+        return self._first_tree
 
     def _validate_url(self):
         """Basic validation that the URL at least starts in the right format and
@@ -70,7 +200,10 @@ class RightmoveData:
 
     @property
     def get_results(self):
-        """Pandas DataFrame of all results returned by the search."""
+        """Pandas DataFrame of all results returned by the search. This is the
+        scraper's own DataFrame, from which `results_count`, `average_price` and
+        `summary` are computed and memoised, so treat it as read-only: modify a
+        `.copy()` of it instead."""
         return self._results
 
     @property
@@ -79,14 +212,14 @@ class RightmoveData:
         rightmove website may state a much higher number of results; this is
         because they artificially restrict the number of results pages that can
         be accessed to 42."""
-        return len(self.get_results)
+        return self._memoised("results_count", lambda: len(self.get_results))
 
     @property
     def average_price(self):
         """Average price of all results returned by `get_results` (ignoring
         results which don't list a price)."""
-        total = self.get_results["price"].dropna().sum()
-        return total / self.results_count
+        return self._memoised("average_price",
+                              lambda: self.get_results["price"].dropna().sum() / self.results_count)
 
     def summary(self, by: str = None):
         """DataFrame summarising results by mean price and count. Defaults to
@@ -99,9 +232,13 @@ class RightmoveData:
         if not by:
             by = "type" if "commercial" in self.rent_or_sale else "number_bedrooms"
         assert by in self.get_results.columns, f"Column not found in `get_results`: {by}"
+        # Copied so that changes by the caller don't affect the memoised summary:
+        return self._memoised(("summary", by), lambda: self._summary(by)).copy()
+
+    def _summary(self, by: str):
         df = self.get_results.dropna(axis=0, subset=["price"])
         groupers = {"price": ["count", "mean"]}
-        df = df.groupby(df[by]).agg(groupers)
+        df = df.groupby(df[by], observed=True).agg(groupers)
         df.columns = df.columns.get_level_values(1)
         df.reset_index(inplace=True)
         if "number_bedrooms" in df.columns:
@@ -115,155 +252,229 @@ class RightmoveData:
     def rent_or_sale(self):
         """String specifying if the search is for properties for rent or sale.
         Required because Xpaths are different for the target elements."""
+        return self._rent_or_sale
+
+    def _set_rent_or_sale(self):
+        """Resolve `rent_or_sale` and the matching price Xpath from the URL, once
+        per search rather than on every page."""
         if "/property-for-sale/" in self.url or "/new-homes-for-sale/" in self.url:
-            return "sale"
+            self._rent_or_sale = "sale"
         elif "/property-to-rent/" in self.url:
-            return "rent"
+            self._rent_or_sale = "rent"
         elif "/commercial-property-for-sale/" in self.url:
-            return "sale-commercial"
+            self._rent_or_sale = "sale-commercial"
         elif "/commercial-property-to-let/" in self.url:
-            return "rent-commercial"
+            self._rent_or_sale = "rent-commercial"
         else:
             raise ValueError(f"Invalid rightmove URL:\n\n\t{self.url}")
+        self._xp_prices = self._xp_rent_prices if "rent" in self._rent_or_sale else self._xp_sale_prices
 
     @property
     def results_count_display(self):
         """Returns an integer of the total number of listings as displayed on
         the first page of results. Note that not all listings are available to
         scrape because rightmove limits the number of accessible pages."""
-        tree = html.fromstring(self._first_page)
-        xpath = """//span[@class="searchHeader-resultCount"]/text()"""
-        return int(tree.xpath(xpath)[0].replace(",", ""))
+        return self._memoised("results_count_display", lambda: int(
+            self._xp_result_count(self._parse(self._first_page))[0].replace(",", "")))
 
     @property
     def page_count(self):
         """Returns the number of result pages returned by the search URL. There
         are 24 results per page. Note that the website limits results to a
         maximum of 42 accessible pages."""
-        page_count = self.results_count_display // 24
-        if self.results_count_display % 24 > 0:
+        return self._memoised("page_count", self._page_count)
+
+    def _page_count(self):
+        results_count_display = self.results_count_display
+        page_count = results_count_display // 24
+        if results_count_display % 24 > 0:
             page_count += 1
         # Rightmove will return a maximum of 42 results pages, hence:
         if page_count > 42:
             page_count = 42
         return page_count
 
-    def _get_page(self, request_content: str, get_floorplans: bool = False):
+    @shared_metrics().timed("parse_page")
+    def _get_page(self, request_content: str):
         """Method to scrape data from a single page of search results. Used
         iteratively by the `get_results` method to scrape data from every page
-        returned by the search."""
-        # Process the html:
-        tree = html.fromstring(request_content)
-
-        # Set xpath for price:
-        if "rent" in self.rent_or_sale:
-            xp_prices = """//span[@class="propertyCard-priceValue"]/text()"""
-        elif "sale" in self.rent_or_sale:
-            xp_prices = """//div[@class="propertyCard-priceValue"]/text()"""
-        else:
-            raise ValueError("Invalid URL format.")
-
-        # Set xpaths for listing title, property address, URL, and agent URL:
-        xp_titles = """//div[@class="propertyCard-details"]\
-        //a[@class="propertyCard-link"]\
-        //h2[@class="propertyCard-title"]/text()"""
-        xp_addresses = """//address[@class="propertyCard-address"]//span/text()"""
-        xp_weblinks = """//div[@class="propertyCard-details"]//a[@class="propertyCard-link"]/@href"""
-        xp_agent_urls = """//div[@class="propertyCard-contactsItem"]\
-        //div[@class="propertyCard-branchLogo"]\
-        //a[@class="propertyCard-branchLogo-link"]/@href"""
-
-        # Create data lists from xpaths:
-        price_pcm = tree.xpath(xp_prices)
-        titles = tree.xpath(xp_titles)
-        addresses = tree.xpath(xp_addresses)
+        returned by the search. Returns a dict of equal-length column lists."""
+        # Process the html (the first page's tree is shared with `results_count_display`):
+        tree = self._parse(request_content)
+
+        # Create data lists from xpaths, evaluating each once:
+        price_pcm = self._xp_prices(tree)
+        titles = self._xp_titles(tree)
+        addresses = self._xp_addresses(tree)
         base = "http://www.rightmove.co.uk"
-        weblinks = [f"{base}{tree.xpath(xp_weblinks)[w]}" for w in range(len(tree.xpath(xp_weblinks)))]
-        agent_urls = [f"{base}{tree.xpath(xp_agent_urls)[a]}" for a in range(len(tree.xpath(xp_agent_urls)))]
+        weblinks = [f"{base}{w}" for w in self._xp_weblinks(tree)]
+        agent_urls = [f"{base}{a}" for a in self._xp_agent_urls(tree)]
 
-        # Optionally get floorplan links from property urls (longer runtime):
-        floorplan_urls = list() if get_floorplans else np.nan
-        if get_floorplans:
-            for weblink in weblinks:
-                status_code, content = self._request(weblink)
-                if status_code != 200:
-                    continue
-                tree = html.fromstring(content)
-                xp_floorplan_url = """//*[@id="floorplanTabs"]/div[2]/div[2]/img/@src"""
-                floorplan_url = tree.xpath(xp_floorplan_url)
-                if floorplan_url:
-                    floorplan_urls.append(floorplan_url[0])
-                else:
-                    floorplan_urls.append(np.nan)
-
-        # Store the data in a Pandas DataFrame:
+        # Store the data as columns, padding short lists with None and dropping
+        # rows without an address, which come from placeholders in the html:
         data = [price_pcm, titles, addresses, weblinks, agent_urls]
-        data = data + [floorplan_urls] if get_floorplans else data
-        temp_df = pd.DataFrame(data)
-        temp_df = temp_df.transpose()
         columns = ["price", "type", "address", "url", "agent_url"]
-        columns = columns + ["floorplan_url"] if get_floorplans else columns
-        temp_df.columns = columns
+        n = len(addresses)
+        shared_metrics().count("pages_parsed")
+        return {c: (d + [None] * (n - len(d)))[:n] for c, d in zip(columns, data)}
+
+    def _page_urls(self):
+        """URLs of all the results pages after the first."""
+        return [f"{str(self.url)}&index={p * 24}" for p in range(1, self.page_count + 1, 1)]
+
+    def _iter_pages(self):
+        """Yield the column lists of every page of results in order, starting
+        with the first page. Each page is yielded as soon as it is parsed."""
+        yield self._get_page(self._first_page)
+
+        # Iterate through all pages scraping results:
+        for status_code, content in self._iter_responses(self._page_urls()):
 
-        # Drop empty rows which come from placeholders in the html:
-        temp_df = temp_df[temp_df["address"].notnull()]
+            # Requests to scrape lots of pages eventually get status 400, so:
+            if status_code != 200:
+                break
+
+            yield self._get_page(content)
 
-        return temp_df
+    def iter_results(self):
+        """Scrape the search again page by page, yielding a cleaned DataFrame of
+        each page's results as soon as it is parsed (the first page is reused
+        rather than requested again). Pages are only requested as the iterator
+        is consumed, unless `max_workers` is greater than 1, in which case
+        requests run ahead of the consumer. `get_results` is not changed."""
+        for columns in self._iter_pages():
+            yield self._clean_results(pd.DataFrame(columns))
 
     def _get_results(self, get_floorplans: bool = False):
         """Build a Pandas DataFrame with all results returned by the search."""
-        results = self._get_page(self._first_page, get_floorplans=get_floorplans)
+        pages = self._iter_pages()
+        columns = next(pages)
 
-        # Iterate through all pages scraping results:
-        for p in range(1, self.page_count + 1, 1):
+        # Append the results of every other page to the column buffers:
+        for page in pages:
+            for column, values in page.items():
+                columns[column].extend(values)
 
-            # Create the URL of the specific results page:
-            p_url = f"{str(self.url)}&index={p * 24}"
+        # Build the DataFrame once all pages have been collected:
+        results = self._clean_results(pd.DataFrame(columns))
 
-            # Make the request:
-            status_code, content = self._request(p_url)
+        # Optionally get floorplan links from property urls (longer runtime):
+        if get_floorplans:
+            results["floorplan_url"] = self._get_floorplans(results["url"].tolist())
 
-            # Requests to scrape lots of pages eventually get status 400, so:
-            if status_code != 200:
-                break
+        return results
 
-            # Create a temporary DataFrame of page results:
-            temp_df = self._get_page(content, get_floorplans=get_floorplans)
+    def enrich_floorplans(self, urls: list = None):
+        """Scrape links to the individual floor plan images of listings in
+        `get_results`, storing them in its `floorplan_url` column. Listings
+        whose floor plans are not fetched keep their existing value.
 
-            # Concatenate the temporary DataFrame with the full DataFrame:
-            frames = [results, temp_df]
-            results = pd.concat(frames)
+        Args:
+            urls (list): optionally only fetch floor plans for listings with
+                these `url` values, e.g. newly added listings (else the floor
+                plans of all listings are fetched).
+        """
+        results = self._results
+        if "floorplan_url" not in results.columns:
+            results["floorplan_url"] = pd.Series(np.nan, index=results.index, dtype=object)
+        targets = results["url"] if urls is None else results.loc[results["url"].isin(set(urls)), "url"]
+        results.loc[targets.index, "floorplan_url"] = self._get_floorplans(targets.tolist())
+        self._set_results(results)
+        return results
 
-        return self._clean_results(results)
+    def _get_floorplans(self, weblinks: list):
+        """List of floor plan image links (or NaN where the listing has none or
+        could not be fetched) aligned with `weblinks`. Listing pages are
+        requested concurrently up to `floorplan_workers` at a time."""
+        floorplan_urls = list()
+        for status_code, content in self._iter_responses(weblinks, self._floorplan_workers):
+            if status_code != 200:
+                floorplan_urls.append(np.nan)
+                continue
+            floorplan_url = self._xp_floorplan_url(html.fromstring(content))
+            floorplan_urls.append(floorplan_url[0] if floorplan_url else np.nan)
+        return floorplan_urls
+
+    def _iter_responses(self, urls: list, max_workers: int = None):
+        """Yield the `(status_code, content)` response of every URL in order.
+        When `max_workers` (default: the `max_workers` setting) is greater than
+        1 the requests are made concurrently, but responses are still yielded
+        in the order of `urls`. Requests not yet started are cancelled if the
+        consumer stops iterating early."""
+        max_workers = self._max_workers if max_workers is None else max_workers
+        if max_workers <= 1 or len(urls) <= 1:
+            for url in urls:
+                yield self._request(url)
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._request, url) for url in urls]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
 
     @staticmethod
-    def _clean_results(results: pd.DataFrame):
-        # Reset the index:
-        results.reset_index(inplace=True, drop=True)
+    def _parse_price(price: str):
+        digits = RightmoveData._re_non_digits.sub("", price)
+        return int(digits) if digits else None
 
-        # Convert price column to numeric type:
-        results["price"].replace(regex=True, inplace=True, to_replace=r"\D", value=r"")
-        results["price"] = pd.to_numeric(results["price"])
+    @staticmethod
+    def _parse_postcode(address: str):
+        match = RightmoveData._re_postcode.match(address)
+        if match is None:
+            return None, None
+        outward, inward = match.group("outward").upper(), match.group("inward")
+        return outward, f"{outward} {inward.upper()}" if inward else None
 
-        # Extract short postcode area to a separate column:
-        pat = r"\b([A-Za-z][A-Za-z]?[0-9][0-9]?[A-Za-z]?)\b"
-        results["postcode"] = results["address"].astype(str).str.extract(pat, expand=True)[0]
+    @staticmethod
+    def _parse_title(title: str):
+        match = RightmoveData._re_bedrooms.search(title)
+        if match is None:
+            return title.strip(), None
+        return title.strip(), 0 if match.group("studio") is not None else int(match.group("bedrooms"))
 
-        # Extract full postcode to a separate column:
-        pat = r"([A-Za-z][A-Za-z]?[0-9][0-9]?[A-Za-z]?[0-9]?\s[0-9]?[A-Za-z][A-Za-z])"
-        results["full_postcode"] = results["address"].astype(str).str.extract(pat, expand=True)[0]
+    @staticmethod
+    def _per_value(column: pd.Series, parse):
+        """Apply `parse` once to every distinct value of `column`. Returns the
+        parsed values followed by None, and the position of each row's parsed
+        value in them (missing values point at the trailing None)."""
+        codes, uniques = pd.factorize(column)
+        return [parse(u) for u in uniques] + [None], codes
 
-        # Extract number of bedrooms from `type` to a separate column:
-        pat = r"\b([\d][\d]?)\b"
-        results["number_bedrooms"] = results["type"].astype(str).str.extract(pat, expand=True)[0]
-        results.loc[results["type"].str.contains("studio", case=False), "number_bedrooms"] = 0
-        results["number_bedrooms"] = pd.to_numeric(results["number_bedrooms"])
+    @staticmethod
+    @shared_metrics().timed("clean_results")
+    def _clean_results(results: pd.DataFrame):
+        """Clean the scraped columns, parsing each distinct value once with the
+        patterns compiled with the class: prices and bedrooms to nullable
+        integers, and the postcode area (categorical) and full postcode from
+        the address."""
+        # Reset the index:
+        results.reset_index(inplace=True, drop=True)
 
-        # Clean up annoying white spaces and newlines in `type` column:
-        results["type"] = results["type"].str.strip("\n").str.strip()
+        # Convert price column to integers, keeping only its digits:
+        prices, codes = RightmoveData._per_value(results["price"], RightmoveData._parse_price)
+        results["price"] = pd.array(prices, dtype="Int64")[codes]
+
+        # Extract the postcode area and full postcode, in one match per address:
+        postcodes, codes = RightmoveData._per_value(results["address"], RightmoveData._parse_postcode)
+        postcodes[-1] = (None, None)
+        areas, full_postcodes = (np.array(column, dtype=object)[codes] for column in zip(*postcodes))
+        results["postcode"] = pd.Categorical(areas)
+        results["full_postcode"] = pd.Series(full_postcodes, dtype=results["address"].dtype)
+
+        # Extract number of bedrooms from `type` to a separate column (studios
+        # have none), and clean up annoying white spaces and newlines in `type`:
+        titles, codes = RightmoveData._per_value(results["type"], RightmoveData._parse_title)
+        titles[-1] = (None, None)
+        types, bedrooms = zip(*titles)
+        results["type"] = pd.Series(np.array(types, dtype=object)[codes], dtype=results["type"].dtype)
+        results["number_bedrooms"] = pd.array(bedrooms, dtype="Int64")[codes]
 
         # Add column with datetime when the search was run (i.e. now):
         now = datetime.datetime.now()
         results["search_date"] = now
 
+        shared_metrics().count("rows", len(results))
         return results
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# Columns the listings are grouped by for the price breakdowns:
+group_columns = ["bedrooms", "postcode", "property_type", "bathrooms", "branch"]
+
+
+def _grouped_stats(codes: np.ndarray, prices: np.ndarray, order: np.ndarray, n_groups: int) -> dict:
+    """Price statistics of every group, from the group code of each price and
+    the order which sorts the prices.
+
+    A stable sort of the codes taken in price order gives the prices sorted by
+    (group, price) without sorting the prices again. Counts, means and standard
+    deviations then come from `np.bincount`, and the min, max, median and
+    quartiles are read from the positions of each group in the sorted prices.
+    """
+    # Codes fitting in 16 bits are sorted with numpy's linear-time radix sort
+    sort_codes = codes.astype(np.uint16) if n_groups < 2 ** 16 - 1 else codes
+    # The trailing NaN is read by the quantiles of empty groups
+    ordered = np.append(prices[order][np.argsort(sort_codes[order], kind="stable")], np.nan)
+    counts = np.bincount(codes, minlength=n_groups)[:n_groups]
+    starts = np.cumsum(counts) - counts
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(codes, weights=prices, minlength=n_groups)[:n_groups] / counts
+        deviations = prices - np.append(mean, np.nan)[codes]
+        squares = np.bincount(codes, weights=np.nan_to_num(deviations ** 2), minlength=n_groups)[:n_groups]
+        std = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+
+    def quantile(q):
+        # Linear interpolation between the closest ranks, as in pandas
+        position = starts + np.maximum(counts - 1, 0) * q
+        low, high = np.floor(position).astype(int), np.ceil(position).astype(int)
+        values = ordered[low] * (1 - (position - low)) + ordered[high] * (position - low)
+        return np.where(counts > 0, values, np.nan)
+
+    return {"count": counts, "mean": mean, "median": quantile(0.5), "std": std, "min": quantile(0.0),
+            "max": quantile(1.0), "q25": quantile(0.25), "q75": quantile(0.75)}
+
+
+class PriceStats:
+    """The `PriceStats` of a DataFrame of listings are its overall and grouped
+    price statistics (count, mean, median, std, min, max and quartiles),
+    computed once and shared by every report built from the same data.
+
+    Listings without a price are left out, as are listings without a value
+    for the column being grouped by. The prices are sorted once, and each
+    breakdown is computed in one pass on first access to `by`, then cached.
+    """
+    def __init__(self, df: pd.DataFrame):
+        """Prepare the statistics of `df`.
+
+        Args:
+            df (pd.DataFrame): listings with a `price` column and any of the
+                `group_columns`.
+        """
+        self.df = df
+        self.total = len(df)
+        prices = pd.to_numeric(df["price"], errors="coerce") if "price" in df.columns else pd.Series(np.nan, df.index)
+        prices = prices.to_numpy(dtype=float, na_value=np.nan)
+        self._has_price = ~np.isnan(prices)
+        self._prices = prices[self._has_price]
+        self._order = np.argsort(self._prices, kind="stable")
+        overall = _grouped_stats(np.zeros(len(self._prices), dtype=np.intp), self._prices, self._order, 1)
+        self.overall = {name: values[0] for name, values in overall.items()}
+        self._breakdowns = {}
+
+    def has(self, column: str) -> bool:
+        """Whether `df` has any value in `column`."""
+        return column in self.df.columns and bool(self.df[column].notna().any())
+
+    def by(self, column: str) -> pd.DataFrame:
+        """Price statistics grouped by `column`, indexed by its sorted values."""
+        if column not in self._breakdowns:
+            codes, uniques = pd.factorize(self.df[column][self._has_price], sort=True)
+            codes[codes < 0] = len(uniques)  # Listings without a value go to an extra group, dropped
+            stats = _grouped_stats(codes, self._prices, self._order, len(uniques))
+            self._breakdowns[column] = pd.DataFrame(stats, index=pd.Index(uniques, name=column))
+        return self._breakdowns[column]
@@ -0,0 +1,124 @@
+from datetime import datetime
+from pathlib import Path
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from .listings import columns
+
+# Low-cardinality text columns, stored dictionary encoded and read as categoricals:
+categorical_columns = ["frequency", "property_type", "branch", "let_type", "postcode"]
+integer_columns = ["id", "price", "bedrooms", "bathrooms", "branch_id"]
+datetime_columns = ["first_visible_date", "search_date"]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("ParquetStore requires pyarrow: pip install rightmove_webscraper[parquet] "
+                          "(or pip install pyarrow)")
+
+
+def _schema():
+    """Arrow schema of the listing columns, in `listings.columns` order."""
+    types = {c: pa.dictionary(pa.int32(), pa.string()) for c in categorical_columns}
+    types.update({c: pa.int64() for c in integer_columns})
+    types["first_visible_date"] = pa.timestamp("us", tz="UTC")
+    types["search_date"] = pa.timestamp("us")
+    return pa.schema([(c, types.get(c, pa.string())) for c in columns])
+
+
+class ParquetStore:
+    """The `ParquetStore` keeps the listings of every run in one typed Parquet
+    dataset, partitioned by scrape date (`scrape_date=YYYY-MM-DD/` folders).
+
+    Each `append` writes a new file, so runs never rewrite earlier data. Reads
+    go through `pyarrow.dataset`, so only the requested columns are loaded, and
+    filters on `scrape_date` skip whole partitions while filters on other
+    columns are pushed down to the Parquet row group statistics.
+
+    Columns are stored with the types of `listings.columns`: integers for ids,
+    prices and counts, timestamps for dates, and dictionary encoding (read back
+    as pandas categoricals) for branch, property type, postcode, let type and
+    frequency. Other columns in the appended DataFrame are not stored.
+    """
+    def __init__(self, path: str = "results/listings.parquet"):
+        """Open (or create on first append) a dataset.
+
+        Args:
+            path (str): directory of the dataset.
+        """
+        _require_pyarrow()
+        self.path = Path(path)
+        self.schema = _schema()
+        self.partitioning = ds.partitioning(pa.schema([("scrape_date", pa.string())]), flavor="hive")
+
+    def _typed(self, df: pd.DataFrame) -> pd.DataFrame:
+        """`df` with the columns of the schema, converted to their stored types."""
+        typed = pd.DataFrame(index=range(len(df)))
+        for c in columns:
+            values = df[c].reset_index(drop=True) if c in df else pd.Series([None] * len(df), dtype=object)
+            if c in integer_columns:
+                values = pd.to_numeric(values, errors="coerce").astype("Int64")
+            elif c == "first_visible_date":
+                values = pd.to_datetime(values, errors="coerce", utc=True, format="ISO8601")
+            elif c == "search_date":
+                values = pd.to_datetime(values, errors="coerce", format="ISO8601")
+            elif c in categorical_columns:
+                values = values.astype("category")
+            typed[c] = values
+        return typed
+
+    def append(self, df: pd.DataFrame, scrape_date: str = None) -> Path:
+        """Write the listings of one run as a new file in its date's partition.
+
+        Args:
+            df (pd.DataFrame): listings, e.g. as returned by `scrape_all_pages`.
+            scrape_date (str): partition date as YYYY-MM-DD (default: the date of
+                the first `search_date`, else today).
+
+        Returns:
+            Path of the written file.
+        """
+        typed = self._typed(df)
+        if scrape_date is None:
+            first = typed["search_date"].dropna()
+            scrape_date = (first.iloc[0] if len(first) else datetime.now()).strftime("%Y-%m-%d")
+        folder = self.path / f"scrape_date={scrape_date}"
+        folder.mkdir(parents=True, exist_ok=True)
+        file = folder / f"part-{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        table = pa.Table.from_pandas(typed, schema=self.schema, preserve_index=False)
+        pq.write_table(table, file, compression="zstd")
+        return file
+
+    def dataset(self) -> "ds.Dataset":
+        """The stored listings as a lazy `pyarrow.dataset.Dataset`, e.g. to scan
+        record batches without loading everything into memory."""
+        return ds.dataset(self.path, format="parquet", partitioning=self.partitioning,
+                          schema=self.schema.append(pa.field("scrape_date", pa.string())))
+
+    def read(self, columns: list = None, filters=None, start: str = None, end: str = None) -> pd.DataFrame:
+        """Load stored listings into a DataFrame.
+
+        Args:
+            columns (list): columns to load (default: all, plus `scrape_date`).
+            filters: a `pyarrow.dataset.Expression` or a list of `(column, op,
+                value)` tuples as accepted by `pyarrow.parquet.read_table`.
+            start (str): first scrape date to load, as YYYY-MM-DD.
+            end (str): last scrape date to load, as YYYY-MM-DD.
+        """
+        if not self.path.exists():
+            return pd.DataFrame(columns=columns if columns is not None else self.schema.names + ["scrape_date"])
+        if filters is not None and not isinstance(filters, ds.Expression):
+            filters = pq.filters_to_expression(filters)
+        for op, date in [("__ge__", start), ("__le__", end)]:
+            if date is not None:
+                expression = getattr(ds.field("scrape_date"), op)(date)
+                filters = expression if filters is None else filters & expression
+        return self.dataset().to_table(columns=columns, filter=filters).to_pandas()
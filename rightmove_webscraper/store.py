@@ -0,0 +1,120 @@
+from collections import namedtuple
+from datetime import datetime
+import sqlite3
+import threading
+
+import pandas as pd
+
+from .listings import columns
+
+# Listing columns stored for each property (search_date becomes first/last seen):
+listing_columns = [c for c in columns if c != "search_date"]
+_column_types = {"id": "INTEGER PRIMARY KEY", "price": "INTEGER", "bedrooms": "INTEGER", "bathrooms": "INTEGER",
+                 "branch_id": "INTEGER"}
+indexed_columns = ["postcode", "branch_id", "bedrooms"]
+
+UpsertResult = namedtuple("UpsertResult", ["new", "changed", "seen"])
+
+
+class ListingStore:
+    """The `ListingStore` is a persistent SQLite database of every listing ever
+    scraped, keyed on property id.
+
+    Each `upsert` of a scrape inserts new listings, updates the stored fields
+    and `last_seen` of known ones, and appends a row to `price_history` only
+    for listings which are new or whose `price` or `added_or_reduced` changed,
+    so the history grows with the number of changes rather than the number of
+    listings scraped. The `postcode`, `branch_id` and `bedrooms` columns are
+    indexed for queries with `listings`.
+    """
+    def __init__(self, path: str = "rightmove_listings.sqlite"):
+        """Open (or create) a store database.
+
+        Args:
+            path (str): path of the SQLite database file.
+        """
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        definitions = ", ".join(f"{c} {_column_types.get(c, 'TEXT')}" for c in listing_columns)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS listings ({definitions}, first_seen TEXT, last_seen TEXT)")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS price_history (
+            id INTEGER, price INTEGER, added_or_reduced TEXT, seen_at TEXT)""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS price_history_id ON price_history (id, seen_at)")
+        for c in indexed_columns:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS listings_{c} ON listings ({c})")
+        self._conn.execute(f"CREATE TEMP TABLE scraped ({definitions})")
+
+    def upsert(self, df: pd.DataFrame, seen_at: str = None) -> UpsertResult:
+        """Store the listings of one scrape.
+
+        Args:
+            df (pd.DataFrame): listings, e.g. as returned by `scrape_all_pages`.
+            seen_at (str): timestamp of the scrape (default: the first
+                `search_date` in `df`, else the current time).
+
+        Returns:
+            UpsertResult with the number of new, changed and scraped listings.
+        """
+        if seen_at is None:
+            dates = df["search_date"].dropna() if "search_date" in df else ()
+            seen_at = pd.Timestamp(dates.iloc[0]).isoformat() if len(dates) else datetime.now().isoformat()
+        rows = df.reindex(columns=listing_columns).astype(object)
+        rows = rows.where(rows.notna(), None).itertuples(index=False, name=None)
+        names = ", ".join(listing_columns)
+        placeholders = ", ".join("?" * len(listing_columns))
+        updates = ", ".join(f"{c} = excluded.{c}" for c in listing_columns[1:])
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM scraped")
+                self._conn.executemany(f"INSERT OR REPLACE INTO scraped VALUES ({placeholders})", rows)
+                new = self._conn.execute("""SELECT COUNT(*) FROM scraped
+                    WHERE id NOT IN (SELECT id FROM listings)""").fetchone()[0]
+                history = self._conn.execute("""INSERT INTO price_history
+                    SELECT s.id, s.price, s.added_or_reduced, ? FROM scraped s LEFT JOIN listings l ON l.id = s.id
+                    WHERE l.id IS NULL OR l.price IS NOT s.price OR l.added_or_reduced IS NOT s.added_or_reduced""",
+                                             (seen_at,)).rowcount
+                self._conn.execute(f"""INSERT INTO listings ({names}, first_seen, last_seen)
+                    SELECT {names}, ?, ? FROM scraped WHERE true
+                    ON CONFLICT (id) DO UPDATE SET {updates}, last_seen = excluded.last_seen""", (seen_at, seen_at))
+                seen = self._conn.execute("SELECT COUNT(*) FROM scraped").fetchone()[0]
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return UpsertResult(new, history - new, seen)
+
+    def listings(self, postcode: str = None, branch_id: int = None, bedrooms: int = None) -> pd.DataFrame:
+        """Stored listings, optionally only those matching every given value."""
+        where = {c: v for c, v in [("postcode", postcode), ("branch_id", branch_id), ("bedrooms", bedrooms)]
+                 if v is not None}
+        sql = "SELECT * FROM listings"
+        if where:
+            sql += " WHERE " + " AND ".join(f"{c} = ?" for c in where)
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=list(where.values()))
+
+    def price_history(self, property_id: int = None) -> pd.DataFrame:
+        """Price and status changes, of one listing or of all, oldest first."""
+        sql = "SELECT * FROM price_history"
+        params = []
+        if property_id is not None:
+            sql += " WHERE id = ?"
+            params.append(property_id)
+        with self._lock:
+            return pd.read_sql_query(sql + " ORDER BY id, seen_at", self._conn, params=params)
+
+    def known(self) -> pd.DataFrame:
+        """The id, price and added_or_reduced of every stored listing, to pass as
+        `known` to `scrape_all_pages` for an incremental scrape."""
+        with self._lock:
+            return pd.read_sql_query("SELECT id, price, added_or_reduced FROM listings", self._conn)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
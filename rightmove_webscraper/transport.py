@@ -0,0 +1,175 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+from .metrics import shared_metrics
+from .ratelimit import TokenBucket
+
+
+class Transport:
+    """The `Transport` is a pooled HTTP client shared by every code path that
+    fetches pages from www.rightmove.co.uk.
+
+    Connections are kept alive and reused between requests, every request is
+    made with connect and read timeouts, and responses with a retryable status
+    code (429 and 5xx) or failed connections are retried with exponential
+    backoff and jitter. Responses are optionally stored in a `ResponseCache`,
+    and requests are optionally paced by a `TokenBucket` rate limiter.
+
+    Requests to rightmove.co.uk can be redirected to another server, such as
+    the bundled `mock_server`, with `base_url` (or the `RIGHTMOVE_BASE_URL`
+    environment variable), without changing the URLs used by the scrapers.
+    """
+    retry_statuses = frozenset({429, 500, 502, 503, 504})
+    rightmove_hosts = frozenset({"www.rightmove.co.uk", "rightmove.co.uk"})
+
+    def __init__(self, timeout: tuple = (5, 30), retries: int = 3, backoff_factor: float = 0.5,
+                 backoff_max: float = 30.0, pool_maxsize: int = 10, headers: dict = None,
+                 session: requests.Session = None, cache: ResponseCache = None,
+                 rate_limiter: TokenBucket = None, base_url: str = None):
+        """Initialize the transport.
+
+        Args:
+            timeout (tuple): `(connect, read)` timeouts in seconds applied to
+                every request.
+            retries (int): maximum number of times a request is retried after a
+                retryable status code or a connection error.
+            backoff_factor (float): base delay in seconds of the exponential
+                backoff between retries; the n-th retry waits a random time up
+                to `backoff_factor * 2 ** n` seconds.
+            backoff_max (float): upper bound in seconds of a single backoff.
+            pool_maxsize (int): maximum number of connections kept alive per
+                host; should be at least the number of concurrent requests.
+            headers (dict): optional headers sent with every request.
+            session (requests.Session): optionally pass a preconfigured session
+                (else a new session is created).
+            cache (ResponseCache): optionally cache successful responses, which
+                are then served from the cache until they expire and are
+                revalidated with the server.
+            rate_limiter (TokenBucket): optionally take a token from this rate
+                limiter before every request (including retries). Pass
+                `shared_rate_limiter()` to share the process-wide limit.
+            base_url (str): optionally send requests for rightmove.co.uk URLs to
+                this scheme and host instead, e.g. "http://127.0.0.1:8000"
+                (default: the `RIGHTMOVE_BASE_URL` environment variable, if set).
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        base_url = base_url if base_url is not None else os.environ.get("RIGHTMOVE_BASE_URL")
+        self.base_url = urlsplit(base_url.rstrip("/")) if base_url else None
+        self.session = session if session is not None else requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url: str) -> requests.Response:
+        """Make a GET request, retrying retryable failures. The response of the
+        final attempt is returned whatever its status code; the exception of
+        the final attempt is raised if the connection could not be made.
+
+        With a cache, fresh entries are returned without a request, and stale
+        entries are revalidated with a conditional request."""
+        url = self.rewrite(url)
+        if self.cache is None:
+            return self._get(url)
+        cached = self.cache.get(url)
+        if cached is not None and (cached.fresh or self.cache.offline):
+            shared_metrics().count("cache_hits")
+            return cached.to_response()
+        if self.cache.offline:
+            raise requests.ConnectionError(f"Offline and not in the response cache: {url}")
+        r = self._get(url, headers=cached.validators if cached is not None else None)
+        if r.status_code == 304 and cached is not None:
+            shared_metrics().count("cache_revalidated")
+            self.cache.refresh(url)
+            return cached.to_response()
+        if r.status_code == 200:
+            self.cache.set(url, r)
+        return r
+
+    def rewrite(self, url: str) -> str:
+        """The URL actually requested for `url`: rightmove.co.uk URLs moved to
+        `base_url` if one is set, else `url` unchanged."""
+        if self.base_url is None:
+            return url
+        parts = urlsplit(url)
+        if parts.hostname not in self.rightmove_hosts:
+            return url
+        path = self.base_url.path + parts.path
+        return urlunsplit((self.base_url.scheme, self.base_url.netloc, path, parts.query, parts.fragment))
+
+    def _get(self, url: str, headers: dict = None) -> requests.Response:
+        metrics = shared_metrics()
+        for attempt in range(self.retries + 1):
+            final = attempt == self.retries
+            if attempt:
+                metrics.count("retries")
+            if self.rate_limiter is not None:
+                with metrics.timer("rate_limit_wait"):
+                    self.rate_limiter.acquire()
+            try:
+                with metrics.timer("request"):
+                    r = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                metrics.count("connection_errors")
+                if final:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            metrics.count("bytes_downloaded", len(r.content))
+            metrics.count(f"responses_{r.status_code}")
+            if self.rate_limiter is not None:
+                if r.status_code == 429:
+                    self.rate_limiter.penalise()
+                elif r.status_code < 400:
+                    self.rate_limiter.reward()
+            if r.status_code not in self.retry_statuses or final:
+                return r
+            time.sleep(self._backoff(attempt, r.headers.get("Retry-After")))
+
+    def _backoff(self, attempt: int, retry_after: str = None) -> float:
+        """Seconds to wait before the next attempt: the server's `Retry-After`
+        if it sent one in seconds, else full-jitter exponential backoff."""
+        if retry_after is not None and retry_after.strip().isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** attempt))
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def default_transport() -> Transport:
+    """Process-wide `Transport` used when no transport is passed explicitly, so
+    that separate searches share the same connection pool. It is not rate
+    limited, so that `RightmoveData` workers aren't serialised: `scrape_all_pages`
+    paces its own page requests with its `delay`, and to cap the rate of every
+    request, pass a `Transport` with a rate limiter, e.g.
+    `Transport(rate_limiter=shared_rate_limiter())`."""
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport
@@ -26,14 +26,15 @@ setup(
     url="https://github.com/toby-p/rightmove_webscraper.py",
     install_requires=REQUIRED,
     tests_require=TESTS_REQUIRE,
-    python_requires='>=3.6',
+    extras_require={"parquet": ["pyarrow>=10.0.0"], "async": ["httpx>=0.23"]},
+    python_requires='>=3.8',
     keywords=["webscraping", "rightmove", "data"],
     license="MIT",
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: End Users/Desktop",
         "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.8",
     ],
     include_package_data=True,
     package_data={"rightmove_webscraper": ["docs/*", "docs/*/*"]}
@@ -0,0 +1,146 @@
+import asyncio
+import subprocess
+import sys
+
+from lxml import html
+import pytest
+
+from rightmove_webscraper import AsyncTokenBucket, AsyncTransport, RightmoveData, Transport
+from rightmove_webscraper.async_transport import Prefetched
+from rightmove_webscraper.mock_server import MockRightmoveServer
+from async_scraper import iter_pages_async, run_batch_async, scrape_all_pages_async
+from test_multi_page_scraper import FakeTransport, listing
+
+rent_url = "https://www.rightmove.co.uk/property-to-rent/find.html?locationIdentifier=REGION%5E92828"
+sale_url = "https://www.rightmove.co.uk/property-for-sale/find.html?locationIdentifier=REGION%5E92828"
+
+
+class FakeAsyncTransport:
+    """Asynchronous wrapper of a `FakeTransport`."""
+    concurrency = 4
+
+    def __init__(self, pages: dict, status_codes: dict = None):
+        self.transport = FakeTransport(pages, status_codes=status_codes)
+
+    async def get(self, url: str):
+        return self.transport.get(url)
+
+
+@pytest.mark.parametrize("backend", ["httpx", "aiohttp"])
+def test_scrape_all_pages_async(backend):
+    """Test every page of a search is scraped through throttling and errors."""
+    pytest.importorskip(backend)
+
+    async def scrape(server):
+        async with AsyncTransport(base_url=server.url, backoff_factor=0, retries=10, backend=backend) as transport:
+            return await scrape_all_pages_async(rent_url, max_pages=50, transport=transport)
+
+    with MockRightmoveServer(results=1500, throttle_rate=0.2, error_rate=0.1, seed=1) as server:
+        df = asyncio.run(scrape(server))
+    assert len(df) == 42 * 24
+    assert df["id"].is_unique
+    assert server.served[429] > 0 and server.served[500] > 0
+
+
+def test_iter_pages_async_stops_early():
+    """Test pages are yielded in order, and requests are cancelled when the
+    consumer stops."""
+    async def first_pages(server):
+        pages = []
+        async with AsyncTransport(base_url=server.url, concurrency=4) as transport:
+            async for df in iter_pages_async(rent_url, transport=transport):
+                pages.append(df)
+                if len(pages) == 3:
+                    break
+        return pages
+
+    with MockRightmoveServer(results=1000, latency=0.01) as server:
+        pages = asyncio.run(first_pages(server))
+    ids = [df["id"].tolist() for df in pages]
+    assert [len(page) for page in ids] == [24, 24, 24]
+    assert len(set(sum(ids, []))) == 72
+    assert server.served[200] < 42
+
+
+def test_run_batch_async():
+    """Test several searches share one rate-limited transport."""
+    searches = {"rent": rent_url, "cheap": rent_url + "&maxPrice=1000",
+                "bad": "https://www.rightmove.co.uk/nothing/find.html"}
+
+    async def run(server):
+        limiter = AsyncTokenBucket(rate=200, burst=20)
+        async with AsyncTransport(base_url=server.url, rate_limiter=limiter) as transport:
+            return await run_batch_async(searches, max_pages=3, transport=transport)
+
+    with MockRightmoveServer(results=200) as server:
+        result = asyncio.run(run(server))
+    report = result.report.set_index("search")
+    assert report.loc["rent", "rows"] == 72
+    assert report.loc["bad", "error"].endswith("404")
+    assert result.properties["id"].is_unique
+    assert set(result.membership["search"]) == {"rent", "cheap"}
+
+
+def test_run_batch_async_failure_after_first_page():
+    """Test a search failing after its first page is reported as failed."""
+    class Searches:
+        concurrency = 4
+        transports = {"1": FakeAsyncTransport({0: [listing(i) for i in range(24)], 24: [listing(24)]}),
+                      "2": FakeAsyncTransport({0: [listing(i) for i in range(24)], 24: [listing(24)]},
+                                              status_codes={24: 500})}
+
+        async def get(self, url: str):
+            return await self.transports[url.split("REGION%5E")[1].split("&")[0]].get(url)
+
+    searches = {"ok": rent_url.replace("92828", "1"), "partial": rent_url.replace("92828", "2")}
+    result = asyncio.run(run_batch_async(searches, transport=Searches()))
+    assert result.report["rows"].tolist() == [25, 0]
+    assert result.report["error"].isna().tolist() == [True, False]
+
+
+def test_import_is_sync_only():
+    """Test importing the package doesn't import the async HTTP clients."""
+    code = "import sys, rightmove_webscraper; print('httpx' in sys.modules or 'aiohttp' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], capture_output=True, text=True).stdout.strip() == "False"
+
+
+def test_prefetched_cancels_on_failure():
+    """Test the requests still pending when one fails are cancelled."""
+    class Failing:
+        cancelled = []
+
+        async def get(self, url: str):
+            if url == "bad":
+                raise ConnectionError(url)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled.append(url)
+                raise
+
+    async def fetch(transport):
+        with pytest.raises(ConnectionError):
+            await Prefetched().fetch(transport, ["slow1", "bad", "slow2"])
+        return list(transport.cancelled)  # Before the event loop cancels whatever is left
+
+    assert sorted(asyncio.run(fetch(Failing()))) == ["slow1", "slow2"]
+
+
+def test_rightmove_data_create_async(monkeypatch):
+    """Test RightmoveData can be built from concurrently fetched pages."""
+    async def create(server):
+        async with AsyncTransport(base_url=server.url) as transport:
+            return await RightmoveData.create_async(sale_url, get_floorplans=True, transport=transport)
+
+    parsed = []
+    fromstring = html.fromstring
+    monkeypatch.setattr(html, "fromstring", lambda content: parsed.append(content) or fromstring(content))
+    with MockRightmoveServer(results=100, layout="legacy") as server:
+        rm = asyncio.run(create(server))
+        assert len(parsed) == len(set(map(id, parsed)))  # Each page (results and listings) parsed once
+        with Transport(base_url=server.url) as transport:
+            assert vars(rm).keys() == vars(RightmoveData(sale_url, transport=transport)).keys()
+    df = rm.get_results
+    assert rm.results_count_display == 100 and len(df) == 100
+    assert rm.rent_or_sale == "sale"
+    assert df["floorplan_url"].notna().any()
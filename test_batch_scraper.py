@@ -0,0 +1,47 @@
+from batch_scraper import load_manifest, run_batch, write_batch
+from test_multi_page_scraper import FakeTransport, listing
+
+
+search_url = "https://www.rightmove.co.uk/property-to-rent/find.html?locationIdentifier=REGION%5E{}"
+
+
+class SearchTransport:
+    """Transport dispatching each search URL to its own `FakeTransport`."""
+    def __init__(self, searches: dict):
+        self.searches = searches
+
+    def get(self, url: str):
+        region = url.split("REGION%5E")[1].split("&")[0]
+        return self.searches[region].get(url)
+
+
+def test_load_manifest(tmp_path):
+    """Test manifests are read from CSV files or plain lists of URLs."""
+    (tmp_path / "manifest.csv").write_text(f"name,url\nnorth,{search_url.format(1)}\n,{search_url.format(2)}\n")
+    assert load_manifest(tmp_path / "manifest.csv") == {"north": search_url.format(1), "search_002": search_url.format(2)}
+    (tmp_path / "manifest.txt").write_text(f"# regions\n{search_url.format(1)}\n\n{search_url.format(2)}\n")
+    assert load_manifest(tmp_path / "manifest.txt") == {"search_001": search_url.format(1),
+                                                        "search_002": search_url.format(2)}
+
+
+def test_run_batch(tmp_path):
+    """Test overlapping searches are de-duplicated by id with their membership
+    recorded, and a failing search (on its first or a later page) is reported
+    without aborting the batch."""
+    transport = SearchTransport({
+        "1": FakeTransport({0: [listing(i) for i in range(24)], 24: [listing(i) for i in range(24, 30)]}),
+        "2": FakeTransport({0: [listing(i) for i in range(20, 40)]}),
+        "3": FakeTransport({0: []}, status_codes={0: 500}),
+        "4": FakeTransport({0: [listing(i) for i in range(24)], 24: [listing(24)]}, status_codes={24: 500}),
+    })
+    searches = {"a": search_url.format(1), "b": search_url.format(2), "c": search_url.format(3),
+                "d": search_url.format(4)}
+    result = run_batch(searches, processes=1, transport=transport)
+    assert sorted(result.properties["id"]) == list(range(40))
+    assert len(result.membership) == 30 + 20
+    assert set(result.membership.loc[result.membership["id"] == 25, "search"]) == {"a", "b"}
+    assert result.report["search"].tolist() == ["a", "b", "c", "d"]
+    assert result.report["rows"].tolist() == [30, 20, 0, 0]
+    assert result.report["error"].isna().tolist() == [True, True, False, False]
+    files = write_batch(result, tmp_path)
+    assert [f.name for f in files] == ["properties.csv", "membership.csv", "report.csv"]
@@ -0,0 +1,57 @@
+import json
+
+from rightmove_webscraper import Metrics, Transport, shared_metrics
+from rightmove_webscraper.mock_server import MockRightmoveServer
+from multi_page_scraper import scrape_all_pages
+
+
+def test_metrics_export():
+    """Test timers and counters are summarised and exported, and nothing is
+    recorded while disabled."""
+    metrics = Metrics(enabled=False)
+    with metrics.timer("request"):
+        metrics.count("rows", 24)
+    assert metrics.to_dict() == {"counters": {}, "timers": {}}
+
+    metrics.enable()
+    for seconds in [0.1, 0.2, 0.3, 0.4]:
+        metrics.observe("request", seconds)
+    metrics.count("rows", 24)
+    metrics.count("rows", 24)
+    with metrics.timer("parse_page"):
+        pass
+    data = json.loads(metrics.to_json())
+    assert data["counters"] == {"rows": 48}
+    assert data["timers"]["request"]["count"] == 4
+    assert (data["timers"]["request"]["p50"], data["timers"]["request"]["max"]) == (0.2, 0.4)
+    assert data["timers"]["parse_page"]["count"] == 1
+
+    text = metrics.to_prometheus()
+    assert "rightmove_rows_total 48\n" in text
+    assert 'rightmove_request_seconds{quantile="0.9"} 0.4\n' in text
+    assert "rightmove_request_seconds_count 4\n" in text
+
+    metrics.reset()
+    assert metrics.to_dict() == {"counters": {}, "timers": {}}
+
+
+def test_scrape_metrics():
+    """Test a scrape records its requests, retries, bytes, pages and rows."""
+    metrics = shared_metrics()
+    metrics.reset()
+    metrics.enable()
+    try:
+        with MockRightmoveServer(results=100, throttle_rate=0.3, seed=2) as server, \
+                Transport(base_url=server.url, backoff_factor=0, retries=10) as transport:
+            url = "https://www.rightmove.co.uk/property-to-rent/find.html?locationIdentifier=REGION%5E92828"
+            scrape_all_pages(url, delay=0, transport=transport)
+        data = metrics.to_dict()
+    finally:
+        metrics.disable()
+        metrics.reset()
+    counters, timers = data["counters"], data["timers"]
+    assert counters["rows"] == 100 and counters["pages_parsed"] == 5
+    assert counters["retries"] == server.served[429]
+    assert counters["bytes_downloaded"] > 0
+    assert timers["request"]["count"] == sum(server.served.values())
+    assert timers["fetch"]["count"] == 5 and timers["scrape_all_pages"]["count"] == 1
@@ -0,0 +1,49 @@
+from rightmove_webscraper import RightmoveData, Transport
+from rightmove_webscraper.mock_server import MockRightmoveServer
+from multi_page_scraper import scrape_all_pages
+from partitioned_scraper import scrape_partitioned
+
+rent_url = "https://www.rightmove.co.uk/property-to-rent/find.html?locationIdentifier=REGION%5E92828"
+
+
+def test_transport_base_url(monkeypatch):
+    """Test only rightmove.co.uk URLs are moved to the base URL."""
+    transport = Transport(base_url="http://127.0.0.1:8000/")
+    assert transport.rewrite(rent_url) == "http://127.0.0.1:8000/property-to-rent/find.html?" \
+                                          "locationIdentifier=REGION%5E92828"
+    assert transport.rewrite("http://www.rightmove.co.uk/properties/1") == "http://127.0.0.1:8000/properties/1"
+    assert transport.rewrite("https://media.rightmove.co.uk/a.png") == "https://media.rightmove.co.uk/a.png"
+    assert Transport().rewrite(rent_url) == rent_url
+    monkeypatch.setenv("RIGHTMOVE_BASE_URL", "http://localhost:9000")
+    assert Transport().rewrite(rent_url).startswith("http://localhost:9000/property-to-rent/")
+
+
+def test_scrape_all_pages_with_failures():
+    """Test every page of a search is scraped through throttling and errors,
+    and pagination stops at the accessible 42 pages."""
+    with MockRightmoveServer(results=1500, throttle_rate=0.2, error_rate=0.1, seed=1) as server, \
+            Transport(base_url=server.url, backoff_factor=0, retries=10) as transport:
+        df = scrape_all_pages(rent_url, max_pages=50, delay=0, transport=transport)
+    assert len(df) == 42 * 24
+    assert df["id"].is_unique
+    assert server.served[429] > 0 and server.served[500] > 0
+
+
+def test_rightmove_data_legacy_layout():
+    """Test RightmoveData scrapes legacy results pages and floorplans."""
+    with MockRightmoveServer(results=100, layout="legacy") as server, \
+            Transport(base_url=server.url, backoff_factor=0) as transport:
+        url = "https://www.rightmove.co.uk/property-for-sale/find.html?locationIdentifier=REGION%5E92828"
+        rm = RightmoveData(url, get_floorplans=True, max_workers=4, transport=transport, floorplan_workers=4)
+    df = rm.get_results
+    assert rm.results_count_display == 100 and len(df) == 100
+    assert rm.rent_or_sale == "sale"
+    assert df["price"].gt(0).all() and df["postcode"].notna().all()
+    assert df["floorplan_url"].notna().sum() == 50
+
+
+def test_partitioned_search():
+    """Test a search over the accessible limit is split and scraped in full."""
+    with MockRightmoveServer(results=3000) as server, Transport(base_url=server.url, backoff_factor=0) as transport:
+        df = scrape_partitioned(rent_url, transport=transport, delay=0)
+    assert len(df) == 3000
@@ -0,0 +1,260 @@
+import json
+import logging
+import threading
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from rightmove_webscraper import nextdata
+from rightmove_webscraper.listings import apply_schema, columns, normalise_listings
+from rightmove_webscraper.stats import PriceStats
+from multi_page_scraper import (Checkpoint, display_summary, find_checkpoint, format_summary, generate_full_statistics,
+                                iter_listings, iter_pages, load_known_listings, scrape_all_pages,
+                                scrape_rightmove_page)
+
+
+base_url = "https://www.rightmove.co.uk/property-to-rent/find.html?locationIdentifier=REGION%5E92828&sortType=6"
+
+
+def listing(property_id: int, price: int = 1200):
+    """A property as it appears in `searchResults.properties`."""
+    return {
+        "id": property_id,
+        "bedrooms": property_id % 3,
+        "bathrooms": 1,
+        "summary": f"A lovely flat number {property_id}",
+        "displayAddress": f"{property_id} Camberwell Road, London SE{property_id % 20 + 1}",
+        "propertySubType": "Flat",
+        "price": {"amount": price, "frequency": "monthly",
+                  "displayPrices": [{"displayPrice": f"£{price:,} pcm"}]},
+        "customer": {"branchId": property_id % 7, "branchDisplayName": f"Agent {property_id % 7}"},
+        "propertyUrl": f"/properties/{property_id}#/?channel=RES_LET",
+        "contactUrl": f"/property-to-rent/contactBranch.html?propertyId={property_id}",
+        "addedOrReduced": "Added today",
+        "firstVisibleDate": "2025-10-01T10:00:00Z",
+        "letType": "Long term",
+    }
+
+
+def next_page(properties: list, result_count: int = None, total_pages: int = 1):
+    """HTML for a results page with the given properties in `__NEXT_DATA__`."""
+    search_results = {
+        "properties": properties,
+        "resultCount": f"{result_count if result_count is not None else len(properties):,}",
+        "pagination": {"total": total_pages, "page": "1"},
+    }
+    data = {"props": {"pageProps": {"searchResults": search_results, "otherProps": {"x": [1, 2]}}},
+            "page": "/property-to-rent/find", "buildId": "abc"}
+    return (f"""<html><head><script>var searchResults = {{}};</script></head><body><div id="__next"></div>
+    <script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>
+    <script src="/_next/static/chunks/main.js"></script></body></html>""").encode("utf-8")
+
+
+class FakeTransport:
+    """Transport serving `pages` (index -> list of properties) for a search."""
+    def __init__(self, pages: dict, result_count: int = None, status_codes: dict = None):
+        self.pages = pages
+        self.result_count = result_count or sum(len(p) for p in pages.values())
+        self.status_codes = status_codes or {}
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def get(self, url: str):
+        index = int(url.split("index=")[1].split("&")[0]) if "index=" in url else 0
+        with self.lock:
+            self.requested.append(index)
+        r = requests.Response()
+        r.url = url
+        r.status_code = self.status_codes.get(index, 200)
+        r._content = next_page(self.pages.get(index, []), self.result_count, len(self.pages))
+        return r
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_extract_search_results(monkeypatch, use_orjson):
+    """Test the searchResults subtree is extracted with and without orjson."""
+    if not use_orjson:
+        monkeypatch.setattr(nextdata, "orjson", None)
+    elif nextdata.orjson is None:
+        pytest.skip("orjson not installed")
+    properties = [listing(i) for i in range(3)]
+    search_results = nextdata.extract_search_results(next_page(properties, 500, 21))
+    assert search_results["properties"] == properties
+    assert search_results["resultCount"] == "500"
+    assert search_results["pagination"]["total"] == 21
+
+
+def test_extract_search_results_missing():
+    """Test a page without __NEXT_DATA__ raises a value error."""
+    with pytest.raises(ValueError):
+        nextdata.extract_search_results(b"<html><body>Access denied</body></html>")
+
+
+def test_scrape_rightmove_page():
+    """Test a single page is parsed into one row per property."""
+    transport = FakeTransport({0: [listing(1, 950), listing(2, 1400)]})
+    df, search_results = scrape_rightmove_page(base_url, transport=transport)
+    assert df["id"].tolist() == [1, 2]
+    assert df["price"].tolist() == [950, 1400]
+    assert df["price_display"].tolist() == ["£950 pcm", "£1,400 pcm"]
+    assert df["postcode"].tolist() == ["SE2", "SE3"]
+    assert df["property_url"].iloc[0] == "https://www.rightmove.co.uk/properties/1#/?channel=RES_LET"
+    assert search_results["resultCount"] == "2"
+
+
+def test_normalise_listings_missing_fields():
+    """Test missing and malformed nested fields become missing values, and the
+    search date is stamped once for the whole page."""
+    sparse = {"id": 7, "price": {"amount": 800, "displayPrices": []}, "customer": None, "displayAddress": "Kent"}
+    df = normalise_listings([listing(1), sparse])
+    assert df.columns.tolist() == columns
+    assert df["price"].tolist() == [1200, 800]
+    assert df.loc[1, ["price_display", "branch", "branch_id", "postcode"]].isna().all()
+    assert df.loc[1, "property_url"] == "https://www.rightmove.co.uk"
+    assert df["search_date"].nunique() == 1
+
+
+def test_scrape_all_pages():
+    """Test every page is fetched and listings are combined in page order."""
+    pages = {i * 24: [listing(i * 24 + j) for j in range(24)] for i in range(4)}
+    transport = FakeTransport(pages)
+    df = scrape_all_pages(base_url, delay=0, transport=transport)
+    assert transport.requested == [0, 24, 48, 72]
+    assert df["id"].tolist() == list(range(96))
+
+
+def test_scrape_all_pages_default_delay():
+    """Test the pages of a search are at least a second apart by default."""
+    pages = {0: [listing(i) for i in range(24)], 24: [listing(24)]}
+    start = time.perf_counter()
+    scrape_all_pages(base_url, transport=FakeTransport(pages))
+    assert time.perf_counter() - start >= 0.9
+
+
+def test_scrape_all_pages_incremental(tmp_path):
+    """Test only new or changed listings are returned, and paging stops after
+    the first page made up entirely of known listings."""
+    pages = {i * 24: [listing(i * 24 + j) for j in range(24)] for i in range(4)}
+    scrape_all_pages(base_url, delay=0, transport=FakeTransport(pages)).to_csv(tmp_path / "properties.csv", index=False)
+
+    # Two new listings are added at the top and one known listing is reduced:
+    pages = {i * 24: [listing(i * 24 + j - 2) for j in range(24)] for i in range(4)}
+    pages[0][0], pages[0][1] = listing(1000), listing(1001)
+    pages[24][5] = listing(27, price=999)
+    transport = FakeTransport(pages)
+    df = scrape_all_pages(base_url, delay=0, transport=transport, known=load_known_listings(tmp_path / "properties.csv"))
+    assert transport.requested == [0, 24]
+    assert df["id"].tolist() == [1000, 1001, 27]
+
+    transport = FakeTransport(pages)
+    df = scrape_all_pages(base_url, delay=0, transport=transport, known=set(range(96)))
+    assert transport.requested == [0, 24]
+    assert df["id"].tolist() == [1000, 1001]
+
+
+def test_price_stats(tmp_path, caplog):
+    """Test the shared price statistics match pandas group-bys, leaving out
+    listings without a price or group value, and feed both reports."""
+    df = normalise_listings([listing(i, price=1000 + (i * 37) % 500) for i in range(60)])
+    df.loc[[3, 10], "price"] = None
+    df.loc[[4, 11], "bedrooms"] = None
+    df["added_or_reduced"] = df["added_or_reduced"].cat.add_categories(["Unused status"])
+    stats = PriceStats(df)
+    for column in ["bedrooms", "postcode", "branch"]:
+        grouped = df.dropna(subset=[column, "price"]).groupby(column, observed=True)["price"]
+        expected = grouped.agg(["count", "mean", "median", "std", "min", "max"])
+        pd.testing.assert_frame_equal(stats.by(column)[expected.columns], expected, check_dtype=False,
+                                      check_index_type=False, check_categorical=False)
+        assert stats.by(column)["q25"].round(6).tolist() == grouped.quantile(0.25).round(6).tolist()
+    assert stats.overall["count"] == 58
+    assert stats.overall["median"] == df["price"].median()
+
+    assert "TOP 15 POSTCODES" in format_summary(df, stats)
+    with caplog.at_level(logging.INFO, logger="multi_page_scraper"):
+        display_summary(df, stats)
+    assert "TOP 15 POSTCODES" in caplog.text
+    report = generate_full_statistics(df, tmp_path, stats=stats).read_text(encoding="utf-8")
+    assert f"Median:  £{df['price'].median():,.2f} pcm" in report
+    assert "FULL BREAKDOWN BY ESTATE AGENT" in report
+    assert "BREAKDOWN BY LISTING STATUS" in report and "Unused status" not in report
+
+
+def test_iter_pages_and_listings():
+    """Test pages are yielded as they are scraped, only requesting the next page
+    when the consumer asks for it, and listings are yielded once per id."""
+    pages = {0: [listing(i) for i in range(24)], 24: [listing(i) for i in range(23, 47)], 48: [listing(47)]}
+    transport = FakeTransport(pages)
+    iterator = iter_pages(base_url, delay=0, transport=transport)
+    assert next(iterator)["id"].tolist() == list(range(24))
+    assert transport.requested == [0]
+    assert [len(df) for df in iterator] == [24, 1]
+    assert transport.requested == [0, 24, 48]
+
+    listings = list(iter_listings(base_url, max_pages=2, delay=0, transport=FakeTransport(pages)))
+    assert [row["id"] for row in listings] == list(range(47))
+    assert listings[0]["property_url"].startswith("https://www.rightmove.co.uk/properties/0")
+
+
+def test_progress_callback(capsys):
+    """Test the progress callback gets every page, including pages replayed
+    from a checkpoint, and nothing is printed."""
+    pages = {i * 24: [listing(i * 24 + j) for j in range(24)] for i in range(4)}
+    updates = []
+    scrape_all_pages(base_url, max_pages=3, delay=0, transport=FakeTransport(pages, result_count=96), progress=updates.append)
+    assert [(p.page, p.pages, p.rows, p.total_rows) for p in updates] == [(1, 3, 24, 24), (2, 3, 24, 48),
+                                                                          (3, 3, 24, 72)]
+    assert updates[0].result_count == "96" and updates[-1].eta == 0
+    assert all(p.elapsed >= 0 and not p.resumed for p in updates)
+    assert capsys.readouterr().out == ""
+
+
+def test_checkpoint_resume(tmp_path):
+    """Test an interrupted scrape resumes after its last completed page, up to
+    max_pages, and a finished one is replayed without requests."""
+    pages = {i * 24: [listing(i * 24 + j) for j in range(24)] for i in range(4)}
+    folder = tmp_path / "scrape_1"
+    transport = FakeTransport(pages, status_codes={48: 500})
+    df = scrape_all_pages(base_url + "&index=0", delay=0, transport=transport, checkpoint=Checkpoint(folder, base_url))
+    assert len(df) == 48
+    assert find_checkpoint(base_url + "&index=24", tmp_path) == folder
+
+    transport = FakeTransport(pages)
+    df = scrape_all_pages(base_url, max_pages=1, transport=transport, checkpoint=Checkpoint(folder, base_url))
+    assert df["id"].tolist() == list(range(24))
+    assert transport.requested == []
+
+    transport = FakeTransport(pages)
+    df = scrape_all_pages(base_url, delay=0, transport=transport, checkpoint=Checkpoint(folder, base_url))
+    assert transport.requested == [48, 72]
+    assert df["id"].tolist() == list(range(96))
+    assert find_checkpoint(base_url, tmp_path) is None
+
+    transport, updates = FakeTransport(pages), []
+    df = scrape_all_pages(base_url, delay=0, transport=transport, checkpoint=Checkpoint(folder, base_url),
+                          progress=updates.append)
+    assert len(df) == 96
+    assert [(p.page, p.resumed) for p in updates] == [(1, True), (2, True), (3, True), (4, True)]
+    assert transport.requested == []
+    other = Checkpoint(folder, base_url.replace("92828", "1"))
+    assert other.pages == [] and not other.complete
+
+
+def test_listing_schema():
+    """Test listings use the compact dtypes, the summary can be dropped, and the
+    schema survives concatenating pages with different categories."""
+    pages = {0: [listing(i) for i in range(24)], 24: [listing(i) for i in range(24, 30)]}
+    pages[24][0]["customer"]["branchDisplayName"] = "Another Agent"
+    df = scrape_all_pages(base_url, delay=0, transport=FakeTransport(pages), summary=False)
+    assert "summary" not in df.columns and len(df) == 30
+    assert {c: str(df[c].dtype) for c in ["id", "price", "bedrooms", "bathrooms", "branch", "postcode"]} == {
+        "id": "Int64", "price": "Int32", "bedrooms": "Int16", "bathrooms": "Int16", "branch": "category",
+        "postcode": "category"}
+    assert str(df["search_date"].dtype).startswith("datetime64")
+    assert "Another Agent" in df["branch"].cat.categories
+    assert normalise_listings([listing(1)], "2026-10-15T10:00:00")["search_date"].iloc[0] == \
+        pd.Timestamp("2026-10-15T10:00:00")
+    saved = df.astype({"search_date": str})
+    assert str(apply_schema(saved)["search_date"].dtype).startswith("datetime64")
+    assert pd.api.types.is_string_dtype(saved["search_date"])  # The caller's frame is left as it was
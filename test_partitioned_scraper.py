@@ -0,0 +1,79 @@
+import threading
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+import requests
+
+from partitioned_scraper import _FirstPageTransport, _split_points, plan_partitions, scrape_partitioned
+from test_multi_page_scraper import base_url, listing, next_page
+
+
+class PartitionTransport:
+    """Transport filtering `properties` by the price and bedroom parameters of
+    each search, and only serving its first `cap` results like Rightmove. Pages
+    after the first of searches whose URL contains `failing` get status 500."""
+    def __init__(self, properties: list, cap: int = 48, failing: str = None):
+        self.properties = properties
+        self.cap = cap
+        self.failing = failing
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def get(self, url: str):
+        params = {k: int(v) for k, v in parse_qsl(urlsplit(url).query) if v.isdigit()}
+        with self.lock:
+            self.requested.append(url)
+        matches = [p for p in self.properties
+                   if params.get("minPrice", 0) <= p["price"]["amount"] <= params.get("maxPrice", 10**9)
+                   and params.get("minBedrooms", 0) <= p["bedrooms"] <= params.get("maxBedrooms", 99)]
+        accessible = matches[:self.cap]
+        index = params.get("index", 0)
+        r = requests.Response()
+        r.url = url
+        r.status_code = 500 if self.failing and self.failing in url and index else 200
+        r._content = next_page(accessible[index:index + 24], len(matches), -(-len(accessible) // 24))
+        return r
+
+
+def test_split_points():
+    """Test bands are contiguous, log spaced for wide ranges and never empty."""
+    assert _split_points(600, 1500, 4) == [(600, 825), (826, 1050), (1051, 1275), (1276, 1500)]
+    assert _split_points(0, 100000, 3) == [(0, 46), (47, 2154), (2155, 100000)]
+    assert _split_points(1500, 1501, 5) == [(1500, 1500), (1501, 1501)]
+
+
+def test_scrape_partitioned():
+    """Test a search over the cap is split into sub-queries under it, including
+    on bedrooms for a single price, and every listing is scraped exactly once
+    with each planning request reused as its sub-query's first page."""
+    properties = [listing(i, price=1000 + i * 10) for i in range(200)]
+    properties += [listing(i, price=5000) for i in range(200, 290)]
+    transport = PartitionTransport(properties, cap=48)
+
+    plan = plan_partitions(base_url, limit=48, transport=transport)
+    assert all(count <= 48 for _, count in plan)
+    assert sum(count for _, count in plan) == len(properties)
+    assert any("minBedrooms=2&maxBedrooms=2" in query for query, _ in plan)
+
+    transport.requested.clear()
+    df = scrape_partitioned(base_url, limit=48, transport=transport, delay=0)
+    assert sorted(df["id"]) == list(range(290))
+    first_pages = [url for url in transport.requested if "index=" not in url]
+    assert len(first_pages) == len(set(first_pages))
+
+
+def test_plan_partitions_keeps_only_sub_query_first_pages():
+    """Test the first pages of split searches are dropped while planning."""
+    properties = [listing(i, price=1000 + i * 10) for i in range(200)]
+    counter = _FirstPageTransport(PartitionTransport(properties, cap=48))
+    plan = plan_partitions(base_url, limit=48, transport=counter)
+    assert set(counter.responses) == {query for query, _ in plan}
+
+
+def test_scrape_partitioned_failed_sub_query():
+    """Test a sub-query failing after its first page fails the whole scrape."""
+    properties = [listing(i, price=1000 + i * 10) for i in range(200)]
+    transport = PartitionTransport(properties, cap=48, failing="minPrice=1587&")
+    with pytest.raises(Exception, match="1 of .* sub-queries failed") as error:
+        scrape_partitioned(base_url, limit=48, transport=transport, delay=0)
+    assert "minPrice=1587&" in str(error.value)
@@ -1,4 +1,8 @@
 
+import threading
+import time
+
+from lxml import html
 import pandas as pd
 import pytest
 
@@ -9,6 +13,56 @@ base_url = "https://www.rightmove.co.uk/"
 required_columns = {"address", "agent_url", "number_bedrooms", "postcode", "price", "search_date", "type", "url"}
 
 
+def legacy_page(page: int, result_count: int = 120, per_page: int = 24, sale: bool = False):
+    """HTML for one page of results in the legacy rightmove search layout."""
+    tag = "div" if sale else "span"
+    cards = "".join(
+        f"""<div class="propertyCard">
+        <div class="propertyCard-details"><a class="propertyCard-link" href="/properties/{page}{i:03d}">
+        <h2 class="propertyCard-title">{i % 4 + 1} bedroom flat</h2></a>
+        <address class="propertyCard-address"><span>{i} High Street, London SE{i % 9 + 1} {i % 9}AB</span></address></div>
+        <{tag} class="propertyCard-priceValue">\u00a3{1000 + page * 100 + i:,} pcm</{tag}>
+        <div class="propertyCard-contactsItem"><div class="propertyCard-branchLogo">
+        <a class="propertyCard-branchLogo-link" href="/estate-agents/agent-{i}.html"></a></div></div>
+        </div>"""
+        for i in range(per_page)
+    )
+    header = f"""<span class="searchHeader-resultCount">{result_count:,}</span>"""
+    return f"<html><body>{header}{cards}</body></html>".encode("utf-8")
+
+
+def listing_page(url: str):
+    """Response for a legacy listing page, which has a floor plan image when its
+    property ID is even and returns status 404 when the ID ends in 5."""
+    property_id = int(url.rsplit("/", 1)[1])
+    if property_id % 10 == 5:
+        return 404, b""
+    img = f"""<img src="https://media.rightmove.co.uk/{property_id}_FLP.png">""" if property_id % 2 == 0 else ""
+    return 200, f"""<html><body><div id="floorplanTabs"><div></div><div><div></div>
+    <div>{img}</div></div></div></body></html>""".encode("utf-8")
+
+
+def fake_request(fail_from: int = None, latency: float = 0.0, sale: bool = False, result_count: int = 120):
+    """Stand-in for `RightmoveData._request` serving `legacy_page` content, which
+    returns status 400 for every page index from `fail_from` onwards."""
+    calls = []
+    lock = threading.Lock()
+
+    def _request(url: str):
+        time.sleep(latency)
+        if "/properties/" in url:
+            return listing_page(url)
+        page = int(url.split("&index=")[1]) // 24 if "&index=" in url else 0
+        with lock:
+            calls.append(page)
+        if fail_from is not None and page >= fail_from:
+            return 400, b""
+        return 200, legacy_page(page, result_count=result_count, sale=sale)
+
+    _request.calls = calls
+    return _request
+
+
 def test_sale_residential():
     """Test a search on residential properties for sale."""
     url = f"{base_url}property-for-sale/find.html?searchType=SALE&locationIdentifier=REGION%5E94346&insId=1"
@@ -114,3 +168,153 @@ def test_bad_url():
     bad_url = "https://www.rightmove.co.uk/property"
     with pytest.raises(ValueError):
         _ = RightmoveData(bad_url)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_offline_results_order(monkeypatch, max_workers):
+    """Test pages are reassembled in index order whether fetched sequentially or
+    concurrently."""
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(fake_request(latency=0.01)))
+    url = f"{base_url}property-to-rent/find.html?searchType=RENT&locationIdentifier=REGION%5E94346"
+    rm = RightmoveData(url, max_workers=max_workers)
+    assert rm.page_count == 5
+    assert len(rm.get_results) == 24 * 6
+    pages = rm.get_results["url"].str.extract(r"/properties/(\d)\d{3}$")[0].astype(int)
+    assert pages.tolist() == sorted(pages.tolist())
+    assert required_columns.issubset(set(rm.get_results.columns))
+
+
+def test_offline_concurrent_stops_at_first_failure(monkeypatch):
+    """Test concurrent fetching discards every page after the first non-200
+    response, matching the sequential results."""
+    url = f"{base_url}property-to-rent/find.html?searchType=RENT&locationIdentifier=REGION%5E94346"
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(fake_request(fail_from=3)))
+    sequential = RightmoveData(url).get_results
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(fake_request(fail_from=3)))
+    concurrent = RightmoveData(url, max_workers=4).get_results
+    assert len(sequential) == 24 * 3
+    pd.testing.assert_frame_equal(sequential.drop(columns="search_date"), concurrent.drop(columns="search_date"))
+
+
+@pytest.mark.parametrize("floorplan_workers", [1, 8])
+def test_offline_floorplans(monkeypatch, floorplan_workers):
+    """Test floor plan links stay aligned with their listings, including when
+    listing pages fail or fetch concurrently, and can be enriched for a subset."""
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(fake_request(latency=0.001)))
+    url = f"{base_url}property-to-rent/find.html?searchType=RENT&locationIdentifier=REGION%5E94346"
+    rm = RightmoveData(url, get_floorplans=True, floorplan_workers=floorplan_workers)
+    df = rm.get_results
+    ids = df["url"].str.rsplit("/", n=1).str[1].astype(int)
+    expected = [f"https://media.rightmove.co.uk/{i}_FLP.png" if i % 2 == 0 and i % 10 != 5 else None for i in ids]
+    assert [u if isinstance(u, str) else None for u in df["floorplan_url"]] == expected
+
+    rm = RightmoveData(url, floorplan_workers=floorplan_workers)
+    assert "floorplan_url" not in rm.get_results.columns
+    subset = rm.get_results["url"].iloc[:3].tolist()
+    df = rm.enrich_floorplans(urls=subset)
+    assert df["floorplan_url"].notna().sum() == sum(e is not None for e in expected[:3])
+    assert df["floorplan_url"].iloc[3:].isna().all()
+
+
+def test_offline_sale_prices(monkeypatch):
+    """Test the sale price Xpath is resolved from the URL for sale searches."""
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(fake_request(sale=True)))
+    url = f"{base_url}property-for-sale/find.html?searchType=SALE&locationIdentifier=REGION%5E94346&insId=1"
+    rm = RightmoveData(url)
+    assert rm.rent_or_sale == "sale"
+    assert rm.get_results["price"].notna().all()
+    assert rm.get_results["price"].iloc[:3].tolist() == [1000, 1001, 1002]
+
+
+def test_offline_memoised_properties(monkeypatch):
+    """Test the first page is parsed once and derived properties are memoised
+    until `refresh_data`, or until the results are replaced."""
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(fake_request()))
+    url = f"{base_url}property-to-rent/find.html?searchType=RENT&locationIdentifier=REGION%5E94346"
+    rm = RightmoveData(url)
+    parsed = []
+    fromstring = html.fromstring
+    monkeypatch.setattr(html, "fromstring", lambda content: parsed.append(content) or fromstring(content))
+    assert rm.page_count == 5 and rm.page_count == 5
+    assert rm.results_count_display == 120
+    assert rm.average_price == rm.average_price
+    summary = rm.summary()
+    summary["count"] = 0
+    assert rm.summary()["count"].sum() == rm.results_count
+    assert parsed == []
+
+    rm._set_results(rm.get_results.iloc[:24].copy())
+    assert rm.results_count == 24 and rm.summary()["count"].sum() == 24
+    assert rm.average_price == rm.get_results["price"].dropna().sum() / 24
+    assert rm.page_count == 5
+
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(fake_request(result_count=30)))
+    rm.refresh_data()
+    assert rm.results_count_display == 30
+    assert rm.page_count == 2
+    assert rm.results_count == 24 * 3
+
+
+def test_offline_summary_by_postcode(monkeypatch):
+    """Test postcodes whose listings all lack a price are left out of the
+    summary rather than counted as 0."""
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(fake_request()))
+    rm = RightmoveData(f"{base_url}property-to-rent/find.html?searchType=RENT&locationIdentifier=REGION%5E94346")
+    df = rm.get_results.copy()
+    df.loc[df["postcode"] == "SE1", "price"] = None
+    rm._set_results(df)
+    summary = rm.summary(by="postcode")
+    assert "SE1" not in summary["postcode"].tolist()
+    assert (summary["count"] > 0).all()
+
+
+def test_offline_iter_results(monkeypatch):
+    """Test pages are yielded one cleaned DataFrame at a time, matching
+    `get_results`."""
+    request = fake_request()
+    monkeypatch.setattr(RightmoveData, "_request", staticmethod(request))
+    url = f"{base_url}property-to-rent/find.html?searchType=RENT&locationIdentifier=REGION%5E94346"
+    rm = RightmoveData(url)
+    del request.calls[:]
+    pages = rm.iter_results()
+    first = next(pages)
+    assert len(first) == 24 and request.calls == []
+    combined = pd.concat([first] + list(pages), ignore_index=True)
+    assert request.calls == [1, 2, 3, 4, 5]
+    pd.testing.assert_frame_equal(combined.drop(columns="search_date"), rm.get_results.drop(columns="search_date"))
+
+
+@pytest.mark.parametrize("address, postcode, full_postcode", [
+    ("10 Downing Street, London SW1A 2AA", "SW1A", "SW1A 2AA"),
+    ("Flat 4, Block A1, Camberwell Road, London SE5", "SE5", None),
+    ("12 High Street, London se18 6ab", "SE18", "SE18 6AB"),
+    ("Westferry Circus, Canary Wharf, London E14", "E14", None),
+    ("Coventry Road, Birmingham B33 8TH", "B33", "B33 8TH"),
+    ("Piccadilly, Manchester M1 1AE", "M1", "M1 1AE"),
+    ("Wapping High Street, London E1W 1AA", "E1W", "E1W 1AA"),
+    ("Brighton Road, Croydon CR2  6XH", "CR2", "CR2 6XH"),
+    ("W1J 7NT, Berkeley Square, Mayfair", "W1J", "W1J 7NT"),
+    ("Flat 10B, Station Road, London", None, None),
+])
+def test_clean_results_postcodes(address, postcode, full_postcode):
+    """Test the postcode area and full postcode are extracted from addresses,
+    preferring the last postcode in the address, normalised to upper case."""
+    df = RightmoveData._clean_results(pd.DataFrame({"price": ["£1,000 pcm"], "type": ["Flat"], "address": [address]}))
+    assert str(df["postcode"].dtype) == "category"
+    assert (df.loc[0, "postcode"] if pd.notna(df.loc[0, "postcode"]) else None) == postcode
+    assert (df.loc[0, "full_postcode"] if pd.notna(df.loc[0, "full_postcode"]) else None) == full_postcode
+
+
+def test_clean_results_prices_and_bedrooms():
+    """Test prices and bedrooms become nullable integers, with studios having
+    no bedrooms and missing or unparsable values left missing."""
+    df = RightmoveData._clean_results(pd.DataFrame({
+        "price": ["£1,250 pcm", "POA", "£500,000", None, "£1,250 pcm"],
+        "type": ["\n    2 bedroom flat\n", "STUDIO apartment", "10 bedroom detached house", "Parking", None],
+        "address": ["London SE1", "London SE1", None, "London N1", "London SE1"],
+    }))
+    assert str(df["price"].dtype) == "Int64" and str(df["number_bedrooms"].dtype) == "Int64"
+    assert df["price"].tolist() == [1250, pd.NA, 500000, pd.NA, 1250]
+    assert df["number_bedrooms"].tolist() == [2, 0, 10, pd.NA, pd.NA]
+    assert df["type"].iloc[:4].tolist() == ["2 bedroom flat", "STUDIO apartment", "10 bedroom detached house", "Parking"]
+    assert df["postcode"].isna().tolist() == [False, False, True, False, False]
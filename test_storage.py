@@ -0,0 +1,48 @@
+import pytest
+
+from rightmove_webscraper import ListingStore, ParquetStore
+from rightmove_webscraper.listings import normalise_listings
+from test_multi_page_scraper import listing
+
+
+def test_parquet_store_append_and_read(tmp_path):
+    """Test runs are appended to date partitions with typed columns, and reads
+    can select columns and filter on values and scrape dates."""
+    pytest.importorskip("pyarrow")
+    store = ParquetStore(tmp_path / "listings.parquet")
+    assert store.read().empty
+    store.append(normalise_listings([listing(i) for i in range(30)], "2026-10-15T10:00:00"))
+    store.append(normalise_listings([listing(i, price=1500) for i in range(20, 40)], "2026-10-16T10:00:00"))
+    store.append(normalise_listings([listing(i, price=1400) for i in range(5)], "2026-10-16T11:00:00"))
+    assert sorted(p.name for p in (tmp_path / "listings.parquet").iterdir()) == [
+        "scrape_date=2026-10-15", "scrape_date=2026-10-16"]
+
+    df = store.read()
+    assert len(df) == 55
+    assert str(df["branch"].dtype) == "category" and str(df["postcode"].dtype) == "category"
+    assert str(df["price"].dtype) == "int64"
+    assert str(df["search_date"].dtype).startswith("datetime64")
+
+    df = store.read(columns=["id", "price"], filters=[("price", ">", 1300)], start="2026-10-16")
+    assert list(df.columns) == ["id", "price"]
+    assert len(df) == 25
+    assert len(store.read(end="2026-10-15")) == 30
+
+
+def test_listing_store_upsert(tmp_path):
+    """Test upserts track first and last seen, and only add price history rows
+    for new listings and changes of price or status."""
+    store = ListingStore(tmp_path / "listings.sqlite")
+    assert store.upsert(normalise_listings([listing(i) for i in range(10)], "2026-10-15T10:00:00")) == (10, 0, 10)
+    properties = [listing(i) for i in range(5, 15)]
+    properties[0]["price"]["amount"] = 999
+    properties[1]["addedOrReduced"] = "Reduced today"
+    assert store.upsert(normalise_listings(properties, "2026-10-16T10:00:00")) == (5, 2, 10)
+    assert store.upsert(normalise_listings(properties, "2026-10-17T10:00:00")) == (0, 0, 10)
+
+    assert len(store) == 15
+    assert store.price_history(5)["price"].tolist() == [1200, 999]
+    assert len(store.price_history()) == 15 + 2
+    row = store.listings(bedrooms=2, postcode="SE9").iloc[0]
+    assert (row["id"], row["first_seen"], row["last_seen"]) == (8, "2026-10-15T10:00:00", "2026-10-17T10:00:00")
+    assert sorted(store.known()["id"]) == list(range(15))
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from rightmove_webscraper import ResponseCache, TokenBucket, Transport, default_transport, shared_rate_limiter
+from rightmove_webscraper.cache import normalise_url
+
+
+class FakeSession(requests.Session):
+    """Session returning a scripted sequence of status codes, `(status_code,
+    headers)` tuples or exceptions."""
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(kwargs)
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        status_code, headers = outcome if isinstance(outcome, tuple) else (outcome, {})
+        r = requests.Response()
+        r.status_code = status_code
+        r.headers.update(headers)
+        r._content = f"body {len(self.calls)}".encode()
+        return r
+
+
+def test_retries_retryable_statuses():
+    """Test 429 and 5xx responses are retried until a success."""
+    session = FakeSession([429, 503, 200])
+    transport = Transport(backoff_factor=0, session=session)
+    r = transport.get("https://www.rightmove.co.uk/")
+    assert r.status_code == 200
+    assert len(session.calls) == 3
+    assert all(c["timeout"] == transport.timeout for c in session.calls)
+
+
+def test_returns_final_response_when_retries_exhausted():
+    """Test the last response is returned once all retries are used up, and
+    non-retryable statuses are not retried."""
+    transport = Transport(retries=2, backoff_factor=0, session=FakeSession([500, 500, 500]))
+    assert transport.get("https://www.rightmove.co.uk/").status_code == 500
+    session = FakeSession([404])
+    assert Transport(backoff_factor=0, session=session).get("https://www.rightmove.co.uk/").status_code == 404
+    assert len(session.calls) == 1
+
+
+def test_connection_errors():
+    """Test connection errors are retried, then raised on the final attempt."""
+    transport = Transport(backoff_factor=0, session=FakeSession([requests.ConnectionError(), 200]))
+    assert transport.get("https://www.rightmove.co.uk/").status_code == 200
+    transport = Transport(retries=1, backoff_factor=0, session=FakeSession([requests.Timeout()] * 2))
+    with pytest.raises(requests.Timeout):
+        transport.get("https://www.rightmove.co.uk/")
+
+
+def test_backoff_honours_retry_after():
+    """Test the server's Retry-After is used, capped at `backoff_max`."""
+    transport = Transport(backoff_factor=1, backoff_max=10)
+    assert transport._backoff(0, "3") == 3
+    assert transport._backoff(0, "120") == 10
+    assert 0 <= transport._backoff(5) <= 10
+
+
+def test_normalise_url():
+    """Test cache keys ignore parameter order, host case and fragments, but keep
+    every parameter value including the page index."""
+    a = "https://WWW.rightmove.co.uk/property-to-rent/find.html?b=2&a=1&index=24#top"
+    b = "https://www.rightmove.co.uk/property-to-rent/find.html?index=24&a=1&b=2"
+    assert normalise_url(a) == normalise_url(b)
+    assert normalise_url(b) != normalise_url(b.replace("index=24", "index=48"))
+
+
+def test_cache_serves_fresh_and_revalidates_stale(tmp_path):
+    """Test fresh entries are served without requests, and stale entries are
+    revalidated with their ETag and refreshed on 304."""
+    url = "https://www.rightmove.co.uk/property-to-rent/find.html?index=24"
+    session = FakeSession([(200, {"ETag": '"v1"'}), (304, {}), (200, {"ETag": '"v2"'})])
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttl=60)
+    transport = Transport(session=session, cache=cache)
+    assert transport.get(url).content == b"body 1"
+    r = transport.get(url)
+    assert r.content == b"body 1" and r.from_cache
+    assert len(session.calls) == 1
+
+    cache.refresh(url, ttl=-1)
+    assert transport.get(url).content == b"body 1"
+    assert session.calls[1]["headers"] == {"If-None-Match": '"v1"'}
+    assert cache.get(url).fresh
+
+    cache.refresh(url, ttl=-1)
+    assert transport.get(url).content == b"body 3"
+    assert cache.get(url).etag == '"v2"'
+
+
+def test_cache_lru_eviction_and_offline(tmp_path):
+    """Test the least recently used entries are evicted beyond `max_bytes`, and
+    offline mode replays stored entries without requests."""
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=40)
+    transport = Transport(session=FakeSession([200, 200, 200, 404]), cache=cache)
+    urls = [f"https://www.rightmove.co.uk/find.html?index={i}" for i in range(3)]
+    transport.get(urls[0])
+    transport.get(urls[1])
+    cache.get(urls[0])
+    transport.get(urls[2])
+    assert cache.get(urls[1]) is None
+    assert cache.get(urls[0]) is not None and cache.get(urls[2]) is not None
+    transport.get(urls[0] + "&missing=1")
+    assert len(cache) == 2
+
+    offline = Transport(session=FakeSession([]), cache=ResponseCache(tmp_path / "cache.sqlite", ttl=-1, offline=True))
+    assert offline.get(urls[2]).content == b"body 3"
+    with pytest.raises(requests.ConnectionError):
+        offline.get(urls[1])
+
+
+def test_token_bucket_rate():
+    """Test the bucket allows `burst` requests at once, then `rate` per second,
+    across threads."""
+    bucket = TokenBucket(rate=50, burst=5)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(15)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 0.18 <= time.monotonic() - start < 0.5
+
+
+def test_rate_limiter_adapts_to_429():
+    """Test 429 responses halve the rate and successes recover it."""
+    bucket = TokenBucket(rate=1000, burst=10, recovery=0.25)
+    transport = Transport(backoff_factor=0, session=FakeSession([429, 429, 200]), rate_limiter=bucket)
+    assert transport.get("https://www.rightmove.co.uk/").status_code == 200
+    assert bucket.rate == 1000 / 4 + 250
+    for _ in range(3):
+        bucket.reward()
+    assert bucket.rate == bucket.max_rate
+
+
+def test_shared_rate_limiter_is_opt_in():
+    """Test the default transport is not capped by the shared rate limit."""
+    assert default_transport().rate_limiter is None
+    assert Transport(rate_limiter=shared_rate_limiter()).rate_limiter is shared_rate_limiter()